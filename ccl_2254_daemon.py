@@ -0,0 +1,296 @@
+# ----------------------------
+# Long-running analysis daemon on a Unix domain socket, with warm LRU caches.
+#
+# Protocol: one JSON object per line in each direction.
+#   request  {"op": "strip" | "keywords" | "first_follow" | "ll1" | "stats" | "shutdown", ...}
+#   response {"ok": true, "result": ...} or {"ok": false, "error": "..."}
+# File ops take {"path": ...} ("strip" may add {"output": ...} to write the cleaned file);
+# grammar ops take {"rules": ["A -> x | y", ...]} or {"grammar": "file.txt"}.
+# File results and grammar files are cached by (path, mtime, size), inline grammars by their rule lines.
+# Lexing and grammar analysis run on a process pool so the event loop stays responsive.
+#
+# usage: python ccl_2254_daemon.py serve [--socket PATH] [--workers N] [--cache-size N]
+#        python ccl_2254_daemon.py client [--socket PATH] OP [PATH_OR_GRAMMAR] [--output FILE]
+# ----------------------------
+import asyncio
+import json
+import multiprocessing
+import os
+import socket
+import stat
+import sys
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from ccl_2254_pipeline import process_c_file
+from ccl_8_2254_batch import read_grammar_file
+from ccl_8_2254_main import analyse_grammar
+
+DEFAULT_SOCKET = os.path.join('/tmp', f"ccl_2254_{os.getuid()}.sock")
+MAX_REQUEST_BYTES = 256 << 20   # longest request line; inline grammars can be large
+
+
+class _LRU:
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        if key in self.data:
+            self.data.move_to_end(key)
+            self.hits += 1
+            return self.data[key]
+        self.misses += 1
+        return None
+
+    def put(self, key, value):
+        self.data[key] = value
+        self.data.move_to_end(key)
+        if len(self.data) > self.maxsize:
+            self.data.popitem(last=False)
+
+    def stats(self):
+        return {'size': len(self.data), 'maxsize': self.maxsize, 'hits': self.hits, 'misses': self.misses}
+
+
+# ---------- jobs (run in pool workers) ----------
+def _file_job(path, output=None):
+    return process_c_file(path, clean_path=output)
+
+
+def _grammar_job(rules):
+    res = analyse_grammar(rules)
+    nts = list(res['grammar_tokens'])
+    return {
+        'start_symbol': res['start_symbol'],
+        'first': {A: sorted(res['FIRST'][A]) for A in nts},
+        'follow': {A: sorted(res['FOLLOW'][A]) for A in nts},
+        'is_ll1': res['is_ll1'],
+        'conflicts': [[A, a, ' '.join(p1), ' '.join(p2)] for A, a, p1, p2 in res['conflicts']],
+    }
+
+
+def _grammar_file_job(path):
+    return _grammar_job(read_grammar_file(path))
+
+
+def _claim_socket(path):
+    """
+    Removes a stale socket left by a daemon that died; refuses to start if a daemon still answers on path
+    or if path is not a socket at all.
+    """
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(st.st_mode):
+        raise RuntimeError(f"{path} exists and is not a socket")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        try:
+            s.connect(path)
+        except ConnectionRefusedError:
+            os.unlink(path)
+            return
+        except FileNotFoundError:
+            return
+    raise RuntimeError(f"another daemon is already listening on {path}")
+
+
+def _new_pool(workers):
+    # forked workers would inherit the listening socket and keep it accepting after the daemon dies
+    ctx = multiprocessing.get_context('forkserver') if 'forkserver' in multiprocessing.get_all_start_methods() else None
+    return ProcessPoolExecutor(max_workers=workers, mp_context=ctx)
+
+
+class AnalysisServer:
+    def __init__(self, socket_path=DEFAULT_SOCKET, workers=None, cache_size=256):
+        self.socket_path = socket_path
+        self.workers = workers
+        self.pool = _new_pool(workers)
+        self.file_cache = _LRU(cache_size)
+        self.grammar_cache = _LRU(cache_size)
+        self.in_flight = {}
+        self.requests = 0
+        self.clients = {}
+        self._stop = None
+
+    async def _run(self, fn, *args):
+        pool = self.pool
+        try:
+            return await asyncio.get_running_loop().run_in_executor(pool, fn, *args)
+        except BrokenProcessPool:
+            # a worker died (OOM kill, segfault) and took the pool with it; later requests get a fresh
+            # one, this one reports the error
+            if self.pool is pool:
+                self.pool = _new_pool(self.workers)
+                pool.shutdown(wait=False)
+            raise
+
+    async def _cached(self, cache, key, fn, *args):
+        found = cache.get(key)
+        if found is not None:
+            return found
+        # identical requests arriving together share one pool job
+        fut = self.in_flight.get(key)
+        if fut is None:
+            fut = asyncio.ensure_future(self._run(fn, *args))
+            self.in_flight[key] = fut
+            try:
+                result = await fut
+            finally:
+                self.in_flight.pop(key, None)
+            cache.put(key, result)
+            return result
+        return await fut
+
+    async def _file_stats(self, req):
+        path = os.path.abspath(req['path'])
+        if req.get('output'):
+            # a written file is a side effect, so never answer it from the cache
+            return await self._run(_file_job, path, req['output'])
+        st = os.stat(path)
+        key = ('file', path, st.st_mtime_ns, st.st_size)
+        return await self._cached(self.file_cache, key, _file_job, path)
+
+    async def _grammar(self, req):
+        if 'rules' in req:
+            rules = [r.strip() for r in req['rules'] if r.strip()]
+            key = ('grammar', tuple(rules))
+            return await self._cached(self.grammar_cache, key, _grammar_job, rules)
+        # the file is read in the worker, not on the event loop
+        path = os.path.abspath(req['grammar'])
+        st = os.stat(path)
+        key = ('grammar_file', path, st.st_mtime_ns, st.st_size)
+        return await self._cached(self.grammar_cache, key, _grammar_file_job, path)
+
+    async def dispatch(self, req):
+        op = req.get('op')
+        if op == 'strip':
+            st = await self._file_stats(req)
+            return {'single_line_comments': st['single_line_comments'],
+                    'multi_line_comments': st['multi_line_comments']}
+        if op == 'keywords':
+            st = await self._file_stats(req)
+            counts = st['keyword_count']
+            return {'keyword_count': counts, 'unique': len(counts), 'total': sum(counts.values())}
+        if op == 'first_follow':
+            g = await self._grammar(req)
+            return {'start_symbol': g['start_symbol'], 'first': g['first'], 'follow': g['follow']}
+        if op == 'll1':
+            g = await self._grammar(req)
+            return {'is_ll1': g['is_ll1'], 'conflicts': g['conflicts']}
+        if op == 'stats':
+            return {'requests': self.requests, 'file_cache': self.file_cache.stats(),
+                    'grammar_cache': self.grammar_cache.stats()}
+        if op == 'shutdown':
+            self._stop.set()
+            return 'shutting down'
+        raise ValueError(f"unknown op {op!r}")
+
+    async def handle(self, reader, writer):
+        self.clients[writer] = asyncio.current_task()
+        try:
+            while not self._stop.is_set():
+                try:
+                    line = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError) as e:
+                    # the rest of the oversized line is still in flight; answer and hang up
+                    resp = {'ok': False, 'error': f"request too large (limit {MAX_REQUEST_BYTES} bytes): {e}"}
+                    writer.write((json.dumps(resp) + '\n').encode('utf-8'))
+                    await writer.drain()
+                    break
+                if not line:
+                    break
+                self.requests += 1
+                try:
+                    result = await self.dispatch(json.loads(line))
+                    resp = {'ok': True, 'result': result}
+                except Exception as e:
+                    resp = {'ok': False, 'error': f"{type(e).__name__}: {e}"}
+                writer.write((json.dumps(resp, ensure_ascii=False) + '\n').encode('utf-8'))
+                await writer.drain()
+        except ConnectionResetError:
+            pass
+        finally:
+            self.clients.pop(writer, None)
+            writer.close()
+
+    async def serve(self):
+        _claim_socket(self.socket_path)
+        self._stop = asyncio.Event()
+        server = await asyncio.start_unix_server(self.handle, path=self.socket_path,
+                                                limit=MAX_REQUEST_BYTES)
+        os.chmod(self.socket_path, 0o600)
+        print(f"Listening on {self.socket_path}", file=sys.stderr)
+        try:
+            async with server:
+                await self._stop.wait()
+                # idle connections see EOF, so their handlers return instead of being cancelled
+                handlers = [t for t in self.clients.values() if t is not asyncio.current_task()]
+                for w in list(self.clients):
+                    w.close()
+                await asyncio.gather(*handlers, return_exceptions=True)
+        finally:
+            self.pool.shutdown()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+
+# ----------------------------
+# Thin client
+# ----------------------------
+def request(req, socket_path=DEFAULT_SOCKET):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.connect(socket_path)
+        try:
+            s.sendall((json.dumps(req, ensure_ascii=False) + '\n').encode('utf-8'))
+        except (BrokenPipeError, ConnectionResetError):
+            pass    # the daemon refused the request early; its error reply may still be readable
+        buf = b''
+        while not buf.endswith(b'\n'):
+            try:
+                chunk = s.recv(65536)
+            except ConnectionResetError:
+                break
+            if not chunk:
+                break
+            buf += chunk
+    if not buf:
+        raise ConnectionError(f"daemon at {socket_path} closed the connection without a reply")
+    return json.loads(buf)
+
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="C-source / grammar analysis daemon and client.")
+    sub = ap.add_subparsers(dest='cmd', required=True)
+    sp = sub.add_parser('serve')
+    sp.add_argument('--socket', default=DEFAULT_SOCKET)
+    sp.add_argument('--workers', type=int, default=None)
+    sp.add_argument('--cache-size', type=int, default=256)
+    cp = sub.add_parser('client')
+    cp.add_argument('--socket', default=DEFAULT_SOCKET)
+    cp.add_argument('op', choices=['strip', 'keywords', 'first_follow', 'll1', 'stats', 'shutdown'])
+    cp.add_argument('target', nargs='?', help="C file for strip/keywords, grammar file for first_follow/ll1")
+    cp.add_argument('--output', help="strip: also write the cleaned file here")
+    args = ap.parse_args()
+
+    if args.cmd == 'serve':
+        try:
+            asyncio.run(AnalysisServer(args.socket, args.workers, args.cache_size).serve())
+        except RuntimeError as e:
+            sys.exit(f"ccl_2254_daemon: {e}")
+    else:
+        req = {'op': args.op}
+        if args.op in ('strip', 'keywords'):
+            req['path'] = os.path.abspath(args.target)
+            if args.output:
+                req['output'] = os.path.abspath(args.output)
+        elif args.op in ('first_follow', 'll1'):
+            req['grammar'] = os.path.abspath(args.target)
+        resp = request(req, args.socket)
+        print(json.dumps(resp, indent=2, ensure_ascii=False))
+        sys.exit(0 if resp.get('ok') else 1)
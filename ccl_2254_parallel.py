@@ -0,0 +1,194 @@
+# ----------------------------
+# Chunk-parallel comment stripping and keyword counting for one very large C file.
+#
+# The file is cut into byte ranges that end on a newline. A worker cannot know the lexer
+# state its range starts in, so it lexes the range speculatively from every state that can be
+# open at a line boundary (CODE, STRING, CHAR, BLOCK). The speculations run in lockstep, line
+# by line; as soon as two of them reach the same state at the end of a line their futures are
+# identical, so the later one stops and refers to the survivor from that point on. In practice
+# STRING/CHAR die after one line and BLOCK at its first '*/', so a range costs about one pass.
+# The parent then walks the ranges in order, picks each one's result for the real incoming
+# state, and writes the cleaned text out. Output and counts equal ccl_2254_pipeline's.
+#
+# usage: python ccl_2254_parallel.py input.c [--clean clean.c] [--workers N] [--chunk-mb 8] [--verify]
+# ----------------------------
+import io
+import locale
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from ccl_2254_pipeline import CLexer, CODE, STRING, CHAR, BLOCK, _IDENT, c_keywords
+
+START_STATES = (CODE, STRING, CHAR, BLOCK)
+
+
+def split_ranges(path, chunk_bytes):
+    """[(start, end), ...] byte ranges covering the file, each ending just after a newline (or at EOF)."""
+    size = os.path.getsize(path)
+    ranges = []
+    with open(path, 'rb') as f:
+        start = 0
+        while start < size:
+            end = start + chunk_bytes
+            if end >= size:
+                end = size
+            else:
+                f.seek(end)
+                f.readline()
+                end = min(f.tell(), size)
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def _lex_range(path, start, end, encoding, keywords):
+    """
+    Lex bytes [start, end) from every start state.
+    Returns {state: (end_state, own_clean, alias, alias_offset, single, multi, keyword_count)}:
+    the full cleaned text for `state` is own_clean + (full cleaned text of alias)[alias_offset:],
+    alias None meaning own_clean is already complete. Counts are always complete.
+    """
+    with open(path, 'rb') as f:
+        f.seek(start)
+        text = f.read(end - start).decode(encoding)
+
+    live = {s: CLexer(s) for s in START_STATES}
+    pieces = {s: [] for s in START_STATES}
+    length = {s: 0 for s in START_STATES}
+    counts = {s: {} for s in START_STATES}
+    merged = {}     # state -> (lexer, alias, alias char offset, alias counters at the merge)
+
+    for line in io.StringIO(text, newline=''):
+        for s, lexer in live.items():
+            clean, code = lexer.feed(line)
+            pieces[s].append(clean)
+            length[s] += len(clean)
+            cnt = counts[s]
+            for word in _IDENT.findall(code):
+                if word in keywords:
+                    cnt[word] = cnt.get(word, 0) + 1
+        # speculations that now sit in the same state will stay identical: keep the first
+        seen = {}
+        for s in list(live):
+            survivor = seen.get(live[s].state)
+            if survivor is None:
+                seen[live[s].state] = s
+                continue
+            other = live[survivor]
+            merged[s] = (live.pop(s), survivor, length[survivor],
+                         (other.single_line, other.multi_line, dict(counts[survivor])))
+
+    results = {}
+
+    def resolve(s):
+        if s in results:
+            return results[s]
+        if s in live:
+            lexer = live[s]
+            res = (lexer.state, ''.join(pieces[s]), None, 0,
+                   lexer.single_line, lexer.multi_line, counts[s])
+        else:
+            lexer, alias, offset, (a_single, a_multi, a_counts) = merged[s]
+            end_state, _, _, _, f_single, f_multi, f_counts = resolve(alias)
+            total = dict(counts[s])
+            for kw, c in f_counts.items():
+                c -= a_counts.get(kw, 0)
+                if c:
+                    total[kw] = total.get(kw, 0) + c
+            res = (end_state, ''.join(pieces[s]), alias, offset,
+                   lexer.single_line + f_single - a_single,
+                   lexer.multi_line + f_multi - a_multi, total)
+        results[s] = res
+        return res
+
+    for s in START_STATES:
+        resolve(s)
+    return results
+
+
+def _chunk_job(args):
+    return _lex_range(*args)
+
+
+def _full_clean(results, state):
+    parts = []
+    offset = 0
+    while state is not None:
+        _, own, alias, alias_offset, _, _, _ = results[state]
+        parts.append(own[offset:])
+        state, offset = alias, alias_offset
+    return ''.join(parts)
+
+
+def parallel_process_c_file(input_path, clean_path=None, workers=None, chunk_bytes=8 << 20,
+                            keywords=c_keywords):
+    """
+    Same stats dict as ccl_2254_pipeline.process_c_file (and the same cleaned file when
+    clean_path is given), with the lexing spread over a process pool.
+    """
+    encoding = locale.getpreferredencoding(False)
+    ranges = split_ranges(input_path, chunk_bytes)
+    jobs = [(input_path, start, end, encoding, keywords) for start, end in ranges]
+    stats = {'single_line_comments': 0, 'multi_line_comments': 0, 'keyword_count': {}, 'chunks': len(ranges)}
+    counts = stats['keyword_count']
+    out = open(clean_path, 'w', newline='') if clean_path else None
+    state = CODE
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # map keeps range order, so the cleaned text can be written as results arrive
+            for results in pool.map(_chunk_job, jobs):
+                end_state, _, _, _, single, multi, cnt = results[state]
+                if out is not None:
+                    out.write(_full_clean(results, state))
+                stats['single_line_comments'] += single
+                stats['multi_line_comments'] += multi
+                for kw, c in cnt.items():
+                    counts[kw] = counts.get(kw, 0) + c
+                state = end_state
+    finally:
+        if out is not None:
+            out.close()
+    return stats
+
+
+if __name__ == "__main__":
+    import argparse
+    import filecmp
+    import tempfile
+    from ccl_2254_pipeline import process_c_file
+
+    ap = argparse.ArgumentParser(description="Strip comments and count keywords of one large C file on all cores.")
+    ap.add_argument('input')
+    ap.add_argument('--clean', help="write the comment-free code here (ccl2)")
+    ap.add_argument('--workers', type=int, default=None)
+    ap.add_argument('--chunk-mb', type=float, default=8)
+    ap.add_argument('--verify', action='store_true', help="also run the sequential pipeline and compare")
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    stats = parallel_process_c_file(args.input, args.clean, args.workers, int(args.chunk_mb * (1 << 20)))
+    elapsed = time.perf_counter() - t0
+    keyword_count = stats['keyword_count']
+
+    print(f"Total single-line comments removed: {stats['single_line_comments']}")
+    print(f"Total multi-line comments removed: {stats['multi_line_comments']}")
+    if args.clean:
+        print(f"Cleaned code saved to '{args.clean}'")
+    print("Total unique keywords found", len(keyword_count))
+    print("Total  keywords occurences", sum(keyword_count.values()))
+    print("\n each keyword count")
+    for kw, count in sorted(keyword_count.items()):
+        print(f"{kw}:{count}")
+    print(f"\n{stats['chunks']} chunks in {elapsed:.2f}s")
+
+    if args.verify:
+        with tempfile.TemporaryDirectory() as tmp:
+            seq_clean = os.path.join(tmp, 'clean.c') if args.clean else None
+            t0 = time.perf_counter()
+            seq = process_c_file(args.input, clean_path=seq_clean)
+            seq_elapsed = time.perf_counter() - t0
+            same = all(seq[k] == stats[k] for k in ('single_line_comments', 'multi_line_comments', 'keyword_count'))
+            if args.clean:
+                same = same and filecmp.cmp(seq_clean, args.clean, shallow=False)
+        print(f"Sequential run: {seq_elapsed:.2f}s, results {'identical' if same else 'DIFFER'}")
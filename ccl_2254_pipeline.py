@@ -0,0 +1,317 @@
+# ----------------------------
+# Fused single-read pipeline for the C-file labs (ccl_1 copy, ccl2 comment stripping,
+# ccl_3 keyword counting). The source is read once, line by line, and pushed through
+# generator stages; intermediate files are only written when a tee stage asks for them.
+#
+# usage: python ccl_2254_pipeline.py input.c [--copy copy.c] [--clean clean.c]
+#                                   [--preserve lines|columns] [--map clean.map.json]
+#
+# Unlike the regexes in ccl2/ccl_3, the lexer here knows about string and character
+# literals, so '//' or '/*' inside "..." is left alone.
+# ----------------------------
+import re
+from array import array
+from bisect import bisect_right
+
+c_keywords = {'int','float','double','for','do','while','return','case','default','void','if','else','break'}
+
+# lexer states (the only ones that can be open at a line boundary)
+CODE, STRING, CHAR, BLOCK = 0, 1, 2, 3
+
+_CODE_EVENT = re.compile(r'"|\'|/\*|//')
+_STRING_BODY = re.compile(r'(?:[^"\\\n]|\\.)*', re.DOTALL)
+_CHAR_BODY = re.compile(r"(?:[^'\\\n]|\\.)*", re.DOTALL)
+_IDENT = re.compile(r'\b[a-zA-Z_]\w*\b')
+
+
+class SourceMap:
+    """
+    Cleaned-text offset -> original offset, filled in by CLexer while it strips.
+    Each run is a stretch of cleaned text copied from one contiguous stretch of the original:
+      clean_starts[i], orig_starts[i]  where run i begins in each text
+    Adjacent runs that stay aligned are merged, so an uncommented file is a single run.
+    Line starts of both texts are kept too, so (line, col) positions translate as well.
+    Every lookup is one bisect.
+    """
+
+    def __init__(self):
+        self.clean_starts = array('q')
+        self.orig_starts = array('q')
+        self.clean_lines = array('q', [0])
+        self.orig_lines = array('q', [0])
+
+    def add(self, clean_pos, orig_pos, length):
+        if length <= 0:
+            return
+        cs, os_ = self.clean_starts, self.orig_starts
+        if not cs or clean_pos - cs[-1] != orig_pos - os_[-1]:
+            cs.append(clean_pos)
+            os_.append(orig_pos)
+
+    def original_offset(self, clean_pos):
+        if not self.clean_starts:
+            return 0
+        i = bisect_right(self.clean_starts, clean_pos) - 1
+        if i < 0:
+            i = 0
+        return self.orig_starts[i] + clean_pos - self.clean_starts[i]
+
+    def original_position(self, line, col):
+        """1-based (line, col) in the cleaned text -> 1-based (line, col) in the original."""
+        orig = self.original_offset(self.clean_lines[line - 1] + col - 1)
+        oline = bisect_right(self.orig_lines, orig)
+        return oline, orig - self.orig_lines[oline - 1] + 1
+
+    def nbytes(self):
+        return sum(a.itemsize * len(a) for a in
+                   (self.clean_starts, self.orig_starts, self.clean_lines, self.orig_lines))
+
+    def to_dict(self):
+        return {name: list(getattr(self, name)) for name in
+                ('clean_starts', 'orig_starts', 'clean_lines', 'orig_lines')}
+
+    @classmethod
+    def from_dict(cls, d):
+        sm = cls()
+        for name in ('clean_starts', 'orig_starts', 'clean_lines', 'orig_lines'):
+            setattr(sm, name, array('q', d[name]))
+        return sm
+
+
+class CLexer:
+    """
+    Line-at-a-time C scanner that carries its state (CODE / STRING / CHAR / BLOCK) across lines.
+    feed(line) returns (clean, code):
+      clean - the line without comments (what ccl2 writes out)
+      code  - clean without string/char literals (what ccl_3 counts keywords in)
+    Comment counts accumulate in single_line / multi_line.
+
+    preserve controls what a comment leaves behind in clean:
+      None      - nothing; block comments swallow their newlines (ccl2 behaviour)
+      'lines'   - the newlines inside it, so line numbers match the original
+      'columns' - a space per character (newlines kept), so lines and columns match
+    With a SourceMap attached, every piece of clean is recorded against its original offset.
+    """
+
+    def __init__(self, state=CODE, preserve=None, source_map=None):
+        if preserve not in (None, 'lines', 'columns'):
+            raise ValueError(f"preserve must be None, 'lines' or 'columns', not {preserve!r}")
+        self.state = state
+        self.single_line = 0
+        self.multi_line = 0
+        self.preserve = preserve
+        self.source_map = source_map
+        self.orig_pos = 0
+        self.clean_pos = 0
+
+    def feed(self, line):
+        clean = []
+        src = []      # original offset (within line) of each piece of clean
+        code = []
+        pos = 0
+        n = len(line)
+        eol = n - 1 if line.endswith('\n') else n
+        state = self.state
+        preserve = self.preserve
+        while pos < n:
+            if state == CODE:
+                m = _CODE_EVENT.search(line, pos)
+                if m is None:
+                    clean.append(line[pos:])
+                    src.append(pos)
+                    code.append(line[pos:])
+                    break
+                start = m.start()
+                clean.append(line[pos:start])
+                src.append(pos)
+                code.append(line[pos:start])
+                tok = m.group()
+                if tok == '//':
+                    self.single_line += 1
+                    if preserve == 'columns':
+                        clean.append(' ' * (eol - start))
+                        src.append(start)
+                    if eol < n:
+                        clean.append('\n')
+                        src.append(eol)
+                        code.append('\n')
+                    break
+                if tok == '/*':
+                    self.multi_line += 1
+                    state = BLOCK
+                    if preserve == 'columns':
+                        clean.append('  ')
+                        src.append(start)
+                    pos = start + 2
+                    continue
+                state = STRING if tok == '"' else CHAR
+                clean.append(tok)
+                src.append(start)
+                pos = start + 1
+            elif state == BLOCK:
+                end = line.find('*/', pos)
+                if end < 0:
+                    if preserve == 'columns':
+                        clean.append(' ' * (eol - pos))
+                        src.append(pos)
+                    if preserve is not None and eol < n:
+                        clean.append('\n')
+                        src.append(eol)
+                    break
+                if preserve == 'columns':
+                    clean.append(' ' * (end + 2 - pos))
+                    src.append(pos)
+                state = CODE
+                pos = end + 2
+            else:
+                body = _STRING_BODY if state == STRING else _CHAR_BODY
+                end = body.match(line, pos).end()
+                clean.append(line[pos:end])
+                src.append(pos)
+                pos = end
+                if pos < n:
+                    # closing quote, or an unescaped newline (unterminated literal: give up on it)
+                    if line[pos] != '\n':
+                        clean.append(line[pos])
+                        src.append(pos)
+                        pos += 1
+                    state = CODE
+        self.state = state
+        out = ''.join(clean)
+        sm = self.source_map
+        if sm is not None:
+            at = self.clean_pos
+            base = self.orig_pos
+            for piece, off in zip(clean, src):
+                sm.add(at, base + off, len(piece))
+                at += len(piece)
+            if eol < n:
+                sm.orig_lines.append(base + n)
+            if out.endswith('\n'):
+                sm.clean_lines.append(at)
+        self.orig_pos += n
+        self.clean_pos += len(out)
+        return out, ''.join(code)
+
+
+# ----------------------------
+# Stages: each factory returns a function stream -> generator, so stages chain freely.
+# ----------------------------
+def read_lines(path):
+    with open(path, 'r', newline='') as f:
+        for line in f:
+            yield line
+
+
+def tee(path, part=None):
+    """
+    Pass items through unchanged, writing them to path (no-op when path is None).
+    For a stream of tuples, part picks the element that is written.
+    """
+    def stage(items):
+        if path is None:
+            yield from items
+            return
+        with open(path, 'w', newline='') as out:
+            for item in items:
+                out.write(item if part is None else item[part])
+                yield item
+    return stage
+
+
+def strip_comments(stats, preserve=None, source_map=None):
+    """
+    Yield (clean, code) per non-empty cleaned line: the line without comments, and its code
+    outside string/char literals for later stages. Comment counts land in stats when the
+    stream ends.
+    """
+    def stage(lines):
+        lexer = CLexer(preserve=preserve, source_map=source_map)
+        feed = lexer.feed
+        for line in lines:
+            clean, code = feed(line)
+            if clean:
+                yield clean, code
+        stats['single_line_comments'] = lexer.single_line
+        stats['multi_line_comments'] = lexer.multi_line
+    return stage
+
+
+def count_keywords(stats, keywords=c_keywords):
+    """
+    Take strip_comments' (clean, code) pairs and yield the clean lines, counting keywords of
+    the code part into stats['keyword_count'] (no second lexer pass).
+    """
+    def stage(pairs):
+        counts = stats.setdefault('keyword_count', {})
+        for clean, code in pairs:
+            for word in _IDENT.findall(code):
+                if word in keywords:
+                    counts[word] = counts.get(word, 0) + 1
+            yield clean
+    return stage
+
+
+def pipeline(source, *stages):
+    stream = source
+    for stage in stages:
+        stream = stage(stream)
+    return stream
+
+
+def drain(stream):
+    for _ in stream:
+        pass
+
+
+def process_c_file(input_path, copy_path=None, clean_path=None, keywords=c_keywords,
+                   preserve=None, source_map=None):
+    """
+    One read of input_path: optional verbatim copy, optional comment-free copy, and
+    comment / keyword statistics. Returns the stats dict.
+    preserve / source_map are passed to the stripping lexer (see CLexer, SourceMap).
+    """
+    stats = {}
+    drain(pipeline(
+        read_lines(input_path),
+        tee(copy_path),
+        strip_comments(stats, preserve, source_map),
+        tee(clean_path, part=0),
+        count_keywords(stats, keywords),
+    ))
+    return stats
+
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="Copy, strip comments and count keywords of a C file in one pass.")
+    ap.add_argument('input')
+    ap.add_argument('--copy', help="write a verbatim copy here (ccl_1)")
+    ap.add_argument('--clean', help="write the comment-free code here (ccl2)")
+    ap.add_argument('--preserve', choices=['lines', 'columns'],
+                    help="keep comment newlines (lines) or blank comments out (columns)")
+    ap.add_argument('--map', help="save the cleaned -> original offset map here (JSON)")
+    args = ap.parse_args()
+
+    source_map = SourceMap() if args.map else None
+    stats = process_c_file(args.input, args.copy, args.clean,
+                           preserve=args.preserve, source_map=source_map)
+    keyword_count = stats['keyword_count']
+
+    if args.copy:
+        print(f"File copied successfully from {args.input} to {args.copy}.")
+    print(f"Total single-line comments removed: {stats['single_line_comments']}")
+    print(f"Total multi-line comments removed: {stats['multi_line_comments']}")
+    if args.clean:
+        print(f"Cleaned code saved to '{args.clean}'")
+    if source_map is not None:
+        import json
+        with open(args.map, 'w') as f:
+            json.dump(source_map.to_dict(), f)
+        print(f"Source map saved to '{args.map}' ({len(source_map.clean_starts)} runs, "
+              f"{source_map.nbytes()} bytes)")
+    print("Total unique keywords found", len(keyword_count))
+    print("Total  keywords occurences", sum(keyword_count.values()))
+    print("\n each keyword count")
+    for kw, count in sorted(keyword_count.items()):
+        print(f"{kw}:{count}")
@@ -0,0 +1,249 @@
+# ----------------------------
+# Translation-unit keyword / comment statistics that follow #include.
+#
+# Every file (unit or header) is lexed once into a FileInfo: comment counts, keyword counts,
+# its #include list, and whether it is protected by an include guard or #pragma once.
+# FileInfos live in a HeaderCache shared by all units, so a header included from a thousand
+# units is still read once. A TranslationUnit only records which FileInfos it pulled in and
+# how many times; its totals are summed from those references when asked for.
+#
+# This is not a full preprocessor: #if / #ifdef are not evaluated (includes in every branch are
+# followed), macros are not expanded, and directive lines are left out of the keyword counts.
+# Include guards are recognised in the usual shape:
+#   #ifndef X / #define X ... #endif   with nothing but blank lines and comments outside.
+#
+# usage: python ccl_2254_preprocess.py unit.c [unit2.c ...] [-I dir ...] [--iquote dir ...]
+#                                     [--isystem dir ...] [--max-depth 200]
+# ----------------------------
+import os
+import re
+
+from ccl_2254_pipeline import CLexer, CODE, _IDENT, c_keywords
+
+_DIRECTIVE = re.compile(r'\s*#\s*(\w+)\s*(.*?)\s*$', re.DOTALL)
+_INCLUDE_ARG = re.compile(r'(<|")([^>"]+)[>"]')
+_IF_NOT_DEFINED = re.compile(r'!\s*defined\s*\(?\s*(\w+)\s*\)?$')
+
+
+class FileInfo:
+    """What one lexing pass learns about a file; shared by every unit that includes it."""
+
+    def __init__(self, path):
+        self.path = path
+        self.single_line = 0
+        self.multi_line = 0
+        self.keyword_count = {}
+        self.includes = []        # [(name, angled), ...] in source order
+        self.guard = None         # include-guard macro, if the whole file is guarded
+        self.pragma_once = False
+
+
+def analyse_file(path, keywords=c_keywords):
+    info = FileInfo(path)
+    lexer = CLexer()
+    counts = info.keyword_count
+    # guard detection: item 0 must be '#ifndef X', item 1 '#define X', and the
+    # conditional opened by item 0 must close on the last item
+    items = 0
+    first = second = None
+    depth = 0
+    closed_at = None
+    continued = False
+    with open(path, 'r', newline='', errors='replace') as f:
+        for line in f:
+            at_code = lexer.state == CODE
+            clean, code = lexer.feed(line)
+            if continued or (at_code and clean.lstrip().startswith('#')):
+                continued = clean.rstrip('\n').endswith('\\')
+                m = _DIRECTIVE.match(clean)
+                if m is None or not m.group(1):
+                    continue
+                name, arg = m.group(1), m.group(2)
+                if name == 'include':
+                    inc = _INCLUDE_ARG.match(arg)
+                    if inc:
+                        info.includes.append((inc.group(2), inc.group(1) == '<'))
+                elif name == 'pragma' and arg == 'once':
+                    info.pragma_once = True
+                if name in ('if', 'ifdef', 'ifndef'):
+                    depth += 1
+                elif name == 'endif':
+                    depth -= 1
+                    if depth == 0 and closed_at is None:
+                        closed_at = items
+                if items == 0:
+                    first = (name, arg)
+                elif items == 1:
+                    second = (name, arg)
+                items += 1
+                continue
+            if not code.strip():
+                continue
+            items += 1
+            for word in _IDENT.findall(code):
+                if word in keywords:
+                    counts[word] = counts.get(word, 0) + 1
+    info.single_line = lexer.single_line
+    info.multi_line = lexer.multi_line
+
+    if first and second and closed_at == items - 1 and second[0] == 'define':
+        macro = None
+        if first[0] == 'ifndef':
+            macro = first[1]
+        elif first[0] == 'if':
+            m = _IF_NOT_DEFINED.match(first[1])
+            macro = m.group(1) if m else None
+        if macro and second[1].split()[:1] == [macro]:
+            info.guard = macro
+    return info
+
+
+class HeaderCache:
+    """realpath -> FileInfo, re-lexed only when the file's mtime or size changes."""
+
+    def __init__(self, keywords=c_keywords):
+        self.keywords = keywords
+        self.files = {}
+        self.lexed = 0
+        self.reused = 0
+
+    def get(self, path):
+        st = os.stat(path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        entry = self.files.get(path)
+        if entry is not None and entry[0] == stamp:
+            self.reused += 1
+            return entry[1]
+        info = analyse_file(path, self.keywords)
+        self.files[path] = (stamp, info)
+        self.lexed += 1
+        return info
+
+
+class IncludeResolver:
+    """
+    "name": the including file's directory, then quote_paths, then search_paths, then system_paths.
+    <name>: search_paths, then system_paths.
+    """
+
+    def __init__(self, search_paths=(), quote_paths=(), system_paths=()):
+        self.search_paths = [os.path.abspath(p) for p in search_paths]
+        self.quote_paths = [os.path.abspath(p) for p in quote_paths]
+        self.system_paths = [os.path.abspath(p) for p in system_paths]
+        self._memo = {}
+
+    def resolve(self, name, angled, from_dir):
+        key = (name, angled, None if angled else from_dir)
+        if key in self._memo:
+            return self._memo[key]
+        dirs = self.search_paths + self.system_paths
+        if not angled:
+            dirs = [from_dir] + self.quote_paths + dirs
+        found = None
+        for d in dirs:
+            candidate = os.path.join(d, name)
+            if os.path.isfile(candidate):
+                found = os.path.realpath(candidate)
+                break
+        self._memo[key] = found
+        return found
+
+
+class TranslationUnit:
+    def __init__(self, path):
+        self.path = path
+        self.files = {}       # realpath -> FileInfo (the cached object, not a copy)
+        self.times = {}       # realpath -> how often it was actually included
+        self.skipped = 0      # inclusions dropped by a guard or #pragma once
+        self.missing = []     # [(includer, name), ...] that no search path resolved
+        self.too_deep = []    # includers cut off at max_depth
+
+    def stats(self):
+        single = multi = 0
+        counts = {}
+        for path, n in self.times.items():
+            info = self.files[path]
+            single += info.single_line * n
+            multi += info.multi_line * n
+            for kw, c in info.keyword_count.items():
+                counts[kw] = counts.get(kw, 0) + c * n
+        return {
+            'single_line_comments': single,
+            'multi_line_comments': multi,
+            'keyword_count': counts,
+            'files': len(self.times),
+            'inclusions': sum(self.times.values()),
+            'skipped_inclusions': self.skipped,
+            'missing_includes': len(self.missing),
+        }
+
+
+def analyse_unit(path, resolver, cache, max_depth=200):
+    unit = TranslationUnit(path)
+    guards = set()
+    once = set()
+
+    def include(target, depth):
+        info = cache.get(target)
+        if (info.pragma_once and target in once) or (info.guard and info.guard in guards):
+            unit.skipped += 1
+            return
+        if info.pragma_once:
+            once.add(target)
+        if info.guard:
+            guards.add(info.guard)
+        unit.files[target] = info
+        unit.times[target] = unit.times.get(target, 0) + 1
+        if depth >= max_depth:
+            unit.too_deep.append(target)
+            return
+        from_dir = os.path.dirname(target)
+        for name, angled in info.includes:
+            found = resolver.resolve(name, angled, from_dir)
+            if found is None:
+                unit.missing.append((target, name))
+            else:
+                include(found, depth + 1)
+
+    include(os.path.realpath(path), 0)
+    return unit
+
+
+def analyse_units(paths, search_paths=(), quote_paths=(), system_paths=(), keywords=c_keywords,
+                  max_depth=200, cache=None):
+    """Returns ([TranslationUnit, ...], cache); pass the cache back in to stay warm."""
+    resolver = IncludeResolver(search_paths, quote_paths, system_paths)
+    if cache is None:
+        cache = HeaderCache(keywords)
+    return [analyse_unit(p, resolver, cache, max_depth) for p in paths], cache
+
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="Comment / keyword statistics per translation unit, following #include.")
+    ap.add_argument('units', nargs='+')
+    ap.add_argument('-I', dest='search', action='append', default=[], help="include search path")
+    ap.add_argument('--iquote', action='append', default=[], help='search path for "..." includes only')
+    ap.add_argument('--isystem', action='append', default=[], help="system include path (searched last)")
+    ap.add_argument('--max-depth', type=int, default=200)
+    args = ap.parse_args()
+
+    units, cache = analyse_units(args.units, args.search, args.iquote, args.isystem,
+                                 max_depth=args.max_depth)
+    for unit in units:
+        stats = unit.stats()
+        keyword_count = stats['keyword_count']
+        print(f"\n--- {unit.path} ---")
+        print(f"Files in unit: {stats['files']} ({stats['inclusions']} inclusions, "
+              f"{stats['skipped_inclusions']} skipped by guards / #pragma once)")
+        print(f"Total single-line comments: {stats['single_line_comments']}")
+        print(f"Total multi-line comments: {stats['multi_line_comments']}")
+        print("Total unique keywords found", len(keyword_count))
+        print("Total  keywords occurences", sum(keyword_count.values()))
+        for kw, count in sorted(keyword_count.items()):
+            print(f"{kw}:{count}")
+        for includer, name in unit.missing:
+            print(f"  unresolved: {name} (from {includer})")
+        for includer in unit.too_deep:
+            print(f"  include depth {args.max_depth} reached in {includer}")
+    print(f"\nHeader cache: {cache.lexed} files lexed, {cache.reused} reuses")
@@ -0,0 +1,178 @@
+# ----------------------------
+# Project-wide identifier table: how often every identifier is used, overall and per file.
+#
+# Identifiers are what CLexer leaves as code (no comments, no string/char literals), minus
+# the C reserved words and preprocessor directive lines. Each distinct name is interned once
+# and gets a small integer id; a file's usage is two parallel arrays (sorted ids, counts).
+# Workers lex batches of files with their own local table and send back their vocabulary
+# once plus the per-file arrays; the parent maps local ids to global ids with one lookup per
+# distinct name, so occurrences themselves never travel or get compared as strings.
+# Top-k queries use heapq.nlargest over the totals array instead of sorting the vocabulary.
+#
+# usage: python ccl_2254_symbols.py src/ [more paths...] [--pattern "*.c,*.h"] [--workers N]
+#                                   [--top 20] [--name IDENT ...]
+# ----------------------------
+import fnmatch
+import heapq
+import os
+import sys
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+
+from ccl_2254_pipeline import CLexer, CODE, _IDENT
+
+C_RESERVED = frozenset({
+    'auto', 'break', 'case', 'char', 'const', 'continue', 'default', 'do', 'double', 'else',
+    'enum', 'extern', 'float', 'for', 'goto', 'if', 'inline', 'int', 'long', 'register',
+    'restrict', 'return', 'short', 'signed', 'sizeof', 'static', 'struct', 'switch', 'typedef',
+    'union', 'unsigned', 'void', 'volatile', 'while', '_Bool', '_Complex', '_Imaginary',
+})
+
+
+class SymbolTable:
+    def __init__(self):
+        self.names = []
+        self.ids = {}
+        self.totals = array('Q')      # occurrences per id over all files
+        self.file_freq = array('I')   # number of files using each id
+        self.files = []               # [(path, ids array('I'), counts array('I')), ...]
+        self._file_index = {}
+
+    def intern(self, name):
+        sid = self.ids.get(name)
+        if sid is None:
+            sid = self.ids[sys.intern(name)] = len(self.names)
+            self.names.append(name)
+            self.totals.append(0)
+            self.file_freq.append(0)
+        return sid
+
+    def add_file(self, path, ids, counts):
+        """ids must be sorted and refer to this table."""
+        totals, freq = self.totals, self.file_freq
+        for sid, c in zip(ids, counts):
+            totals[sid] += c
+            freq[sid] += 1
+        self._file_index[path] = len(self.files)
+        self.files.append((path, ids, counts))
+
+    def merge(self, names, files):
+        """Fold in a worker's result: its local names, and per-file arrays over local ids."""
+        remap = array('I', (self.intern(n) for n in names))
+        for path, ids, counts in files:
+            pairs = sorted(zip((remap[i] for i in ids), counts))
+            self.add_file(path, array('I', (p[0] for p in pairs)), array('I', (p[1] for p in pairs)))
+
+    # ---------- queries ----------
+    def unique_names(self):
+        return sum(1 for t in self.totals if t)
+
+    def top_k(self, k=20):
+        """[(name, occurrences, files), ...] for the k most used identifiers."""
+        best = heapq.nlargest(k, range(len(self.totals)), key=self.totals.__getitem__)
+        return [(self.names[i], self.totals[i], self.file_freq[i]) for i in best]
+
+    def file_top_k(self, path, k=10):
+        _, ids, counts = self.files[self._file_index[path]]
+        best = heapq.nlargest(k, range(len(ids)), key=counts.__getitem__)
+        return [(self.names[ids[j]], counts[j]) for j in best]
+
+    def usage(self, name):
+        """{path: count} for every file that uses name."""
+        sid = self.ids.get(name)
+        if sid is None:
+            return {}
+        found = {}
+        for path, ids, counts in self.files:
+            j = bisect_left(ids, sid)
+            if j < len(ids) and ids[j] == sid:
+                found[path] = counts[j]
+        return found
+
+
+def scan_identifiers(path, table, reserved=C_RESERVED):
+    """{id: count} for one file, interning into table (a SymbolTable or anything with .intern)."""
+    lexer = CLexer()
+    counts = {}
+    intern = table.intern
+    continued = False
+    with open(path, 'r', newline='', errors='replace') as f:
+        for line in f:
+            at_code = lexer.state == CODE
+            clean, code = lexer.feed(line)
+            if continued or (at_code and clean.lstrip().startswith('#')):
+                continued = clean.rstrip('\n').endswith('\\')
+                continue
+            for word in _IDENT.findall(code):
+                if word not in reserved:
+                    sid = intern(word)
+                    counts[sid] = counts.get(sid, 0) + 1
+    return counts
+
+
+def _scan_batch(paths):
+    """Worker: lex a batch of files into a local table; return (names, [(path, ids, counts), ...])."""
+    local = SymbolTable()
+    files = []
+    for path in paths:
+        try:
+            counts = scan_identifiers(path, local)
+        except OSError:
+            continue
+        ids = array('I', sorted(counts))
+        files.append((path, ids, array('I', (counts[i] for i in ids))))
+    return local.names, files
+
+
+def collect_sources(paths, patterns=('*.c', '*.h')):
+    found = []
+    for p in paths:
+        if os.path.isdir(p):
+            for root, dirs, files in os.walk(p):
+                dirs.sort()
+                for name in sorted(files):
+                    if any(fnmatch.fnmatch(name, pat) for pat in patterns):
+                        found.append(os.path.join(root, name))
+        else:
+            found.append(p)
+    return found
+
+
+def build_symbol_table(paths, workers=None, batch_size=64):
+    table = SymbolTable()
+    batches = [paths[i:i + batch_size] for i in range(0, len(paths), batch_size)]
+    if workers == 1 or len(batches) <= 1:
+        for batch in batches:
+            table.merge(*_scan_batch(batch))
+        return table
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for names, files in pool.map(_scan_batch, batches):
+            table.merge(names, files)
+    return table
+
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="Identifier usage statistics over C sources.")
+    ap.add_argument('paths', nargs='+', help="files or directories")
+    ap.add_argument('--pattern', default='*.c,*.h', help="comma-separated file patterns for directories")
+    ap.add_argument('--workers', type=int, default=None)
+    ap.add_argument('--top', type=int, default=20)
+    ap.add_argument('--name', action='append', default=[], help="show per-file usage of this identifier")
+    args = ap.parse_args()
+
+    sources = collect_sources(args.paths, tuple(args.pattern.split(',')))
+    table = build_symbol_table(sources, args.workers)
+
+    print(f"\nFiles scanned: {len(table.files)}")
+    print(f"Unique identifiers: {table.unique_names()}")
+    print(f"Total identifier occurrences: {sum(table.totals)}")
+    print(f"\n--- Top {args.top} identifiers ---")
+    for name, total, nfiles in table.top_k(args.top):
+        print(f"{name}: {total} ({nfiles} files)")
+    for name in args.name:
+        usage = table.usage(name)
+        print(f"\n--- {name}: {sum(usage.values())} uses in {len(usage)} files ---")
+        for path, count in sorted(usage.items()):
+            print(f"{path}: {count}")
@@ -0,0 +1,192 @@
+# ----------------------------
+# Batch grammar analysis (recursion, factoring, FIRST/FOLLOW, LL(1)) over many grammar files.
+# Each grammar runs in a process pool with its own timeout; results stream out as JSON lines.
+#
+# usage: python ccl_8_2254_batch.py grammars/ [more dirs or files] [--manifest list.txt]
+#            [--pattern '*.txt'] [--workers N] [--timeout SEC] [--output results.jsonl]
+#            [--summary summary.json] [--llk K]
+# ----------------------------
+import argparse
+import glob
+import json
+import os
+import signal
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+from ccl_8_2254_llk import llk_analysis
+from ccl_8_2254_main import analyse_grammar
+
+
+class _GrammarTimeout(Exception):
+    pass
+
+
+# per-grammar timeouts need SIGALRM/setitimer, which Windows does not have; there a grammar
+# runs to completion
+_HAVE_ALARM = hasattr(signal, 'SIGALRM') and hasattr(signal, 'setitimer')
+
+
+def read_grammar_file(path):
+    """
+    Same layout the interactive scripts read from stdin: one 'A -> x | y' rule per line,
+    optionally preceded by the rule count. Blank lines and '#' comments are skipped.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = [ln.strip() for ln in f]
+    lines = [ln for ln in lines if ln and not ln.startswith('#')]
+    if lines and lines[0].isdigit():
+        lines = lines[1:1 + int(lines[0])]
+    return lines
+
+
+def analyse_rules(rules, llk_max_k=0):
+    """
+    Runs the ccl_8 pipeline quietly on a list of rule lines and returns a JSON-ready dict.
+    With llk_max_k >= 2, conflicting nonterminals also get the lookahead they need (or null).
+    """
+    res = analyse_grammar(rules)
+    report = res['reduction_report']
+    result = {
+        'rules': len(rules),
+        'left_recursive_rules': res['left_recursive_count'],
+        'factoring_groups': res['factoring_groups'],
+        'removed_symbols': report['non_generating'] + report['unreachable'],
+        'nonterminals': len(res['grammar_tokens']),
+        'terminals': len(res['terminals']) - 1,
+        'table_entries': len(res['table']),
+        'is_ll1': res['is_ll1'],
+        'conflicts': [[A, a, ' '.join(p1), ' '.join(p2)] for A, a, p1, p2 in res['conflicts']],
+    }
+    if llk_max_k >= 2 and res['conflicts']:
+        llk = llk_analysis(res['grammar_tokens'], res['start_symbol'], res['conflicts'], llk_max_k)
+        result['llk'] = {A: r['k'] for A, r in llk.items()}
+    return result
+
+
+def _on_alarm(signum, frame):
+    raise _GrammarTimeout()
+
+
+def _run_one(path, timeout, llk_max_k=0):
+    # Runs inside a pool worker; SIGALRM interrupts a runaway fixpoint without killing the worker.
+    result = {'grammar': path}
+    start = time.perf_counter()
+    alarm = bool(timeout) and _HAVE_ALARM
+    try:
+        if alarm:
+            signal.signal(signal.SIGALRM, _on_alarm)
+            signal.setitimer(signal.ITIMER_REAL, timeout)
+        result.update(analyse_rules(read_grammar_file(path), llk_max_k))
+        result['status'] = 'ok'
+    except _GrammarTimeout:
+        result['status'] = 'timeout'
+    except Exception as e:
+        result['status'] = 'error'
+        result['error'] = f"{type(e).__name__}: {e}"
+    finally:
+        if alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    result['seconds'] = round(time.perf_counter() - start, 6)
+    return result
+
+
+def collect_grammar_paths(paths, manifest=None, pattern='*.txt'):
+    found = []
+    for p in paths:
+        if os.path.isdir(p):
+            found.extend(sorted(glob.glob(os.path.join(p, pattern))))
+        else:
+            found.append(p)
+    if manifest:
+        base = os.path.dirname(manifest)
+        with open(manifest, 'r', encoding='utf-8') as f:
+            for ln in f:
+                ln = ln.strip()
+                if ln and not ln.startswith('#'):
+                    found.append(ln if os.path.isabs(ln) else os.path.join(base, ln))
+    return found
+
+
+def _failed(path, e):
+    return {'grammar': path, 'status': 'error', 'error': f"{type(e).__name__}: {e}"}
+
+
+def _record(result, out, summary):
+    out.write(json.dumps(result, ensure_ascii=False) + '\n')
+    out.flush()
+    if result['status'] == 'timeout':
+        summary['timeouts'].append(result['grammar'])
+    elif result['status'] == 'error':
+        summary['errors'].append(result['grammar'])
+    elif result['is_ll1']:
+        summary['ll1'].append(result['grammar'])
+    else:
+        summary['conflicts'].append(result['grammar'])
+
+
+def run_batch(paths, out, workers=None, timeout=30.0, llk_max_k=0):
+    """
+    Analyses every grammar in paths, writing one JSON line per grammar to out as soon as it finishes.
+    A grammar whose worker dies (OOM kill, segfault) is reported as an error; the rest still run.
+    Returns the summary dict.
+    """
+    summary = {'total': len(paths), 'll1': [], 'conflicts': [], 'timeouts': [], 'errors': []}
+    crashed = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(_run_one, p, timeout, llk_max_k): p for p in paths}
+        for fut in as_completed(futures):
+            try:
+                result = fut.result()
+            except BrokenProcessPool:
+                # one dead worker fails every grammar still queued or running in this pool
+                crashed.append(futures[fut])
+                continue
+            except Exception as e:
+                result = _failed(futures[fut], e)
+            _record(result, out, summary)
+    # rerun those alone, so only the grammar that really kills its worker is reported
+    for path in sorted(crashed):
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            try:
+                result = pool.submit(_run_one, path, timeout, llk_max_k).result()
+            except Exception as e:
+                result = _failed(path, e)
+        _record(result, out, summary)
+    for key in ('ll1', 'conflicts', 'timeouts', 'errors'):
+        summary[key].sort()
+    return summary
+
+
+# ----------------------------
+# CLI
+# ----------------------------
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Batch LL(1) analysis of grammar files.")
+    ap.add_argument('paths', nargs='*', help="grammar files or directories of grammar files")
+    ap.add_argument('--manifest', help="text file listing grammar paths, one per line")
+    ap.add_argument('--pattern', default='*.txt', help="glob used inside directories (default: *.txt)")
+    ap.add_argument('--workers', type=int, default=None)
+    ap.add_argument('--timeout', type=float, default=30.0, help="seconds per grammar (0 = no limit)")
+    ap.add_argument('--output', help="JSON lines output file (default: stdout)")
+    ap.add_argument('--summary', help="write the summary JSON here")
+    ap.add_argument('--llk', type=int, default=0, metavar='K',
+                    help="for conflicting grammars, check which conflicts LL(K) lookahead resolves")
+    args = ap.parse_args()
+
+    grammar_paths = collect_grammar_paths(args.paths, args.manifest, args.pattern)
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        summary = run_batch(grammar_paths, out, args.workers, args.timeout, args.llk)
+    finally:
+        if args.output:
+            out.close()
+
+    if args.summary:
+        with open(args.summary, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+    print(f"{summary['total']} grammars: {len(summary['ll1'])} LL(1), "
+          f"{len(summary['conflicts'])} with conflicts, {len(summary['timeouts'])} timed out, "
+          f"{len(summary['errors'])} failed", file=sys.stderr)
@@ -0,0 +1,127 @@
+# ----------------------------
+# Benchmark harness: time and peak memory of every ccl_8 grammar pass on generated grammars
+# of increasing size, so scaling regressions show up as a jump between rows.
+#
+# usage: python ccl_8_2254_bench.py [--kinds expression wide nullable cycle]
+#            [--sizes 10 100 1000] [--seed 0] [--repeat 3] [--json out.json]
+# ----------------------------
+import argparse
+import json
+import time
+import tracemalloc
+
+from ccl_8_2254_grammar_gen import GENERATORS, generate_grammar
+from ccl_8_2254_main import (
+    build_tokenized_grammar,
+    compute_first_sets,
+    compute_follow_sets,
+    construct_parsing_table,
+    detect_left_recursion,
+    detection_left_factoring,
+    reduce_grammar,
+    removal_left_factoring,
+)
+
+
+def _pass_detect_recursion(st):
+    st['parsed_rules'], _ = detect_left_recursion(st['rules'], verbose=False)
+
+def _pass_detect_factoring(st):
+    _, st['fact_groups'] = detection_left_factoring(st['parsed_rules'], verbose=False)
+
+def _pass_remove_factoring(st):
+    st['final_grammar'] = removal_left_factoring(st['parsed_rules'], verbose=False)
+
+def _pass_tokenize(st):
+    st['grammar_tokens'], _, _, _ = build_tokenized_grammar(st['final_grammar'])
+    st['start'] = st['final_grammar'][0][0]
+
+def _pass_reduce(st):
+    st['grammar_tokens'], _ = reduce_grammar(st['grammar_tokens'], st['start'], verbose=False)
+
+def _pass_first(st):
+    st['FIRST'] = compute_first_sets(st['grammar_tokens'])
+
+def _pass_follow(st):
+    st['FOLLOW'] = compute_follow_sets(st['grammar_tokens'], st['FIRST'], st['start'])
+
+def _pass_table(st):
+    construct_parsing_table(st['grammar_tokens'], st['FIRST'], st['FOLLOW'])
+
+
+# Order matters: each pass consumes what the previous ones left in the state dict.
+PASSES = [
+    ('detect_left_recursion', _pass_detect_recursion),
+    ('detection_left_factoring', _pass_detect_factoring),
+    ('removal_left_factoring', _pass_remove_factoring),
+    ('build_tokenized_grammar', _pass_tokenize),
+    ('reduce_grammar', _pass_reduce),
+    ('compute_first_sets', _pass_first),
+    ('compute_follow_sets', _pass_follow),
+    ('construct_parsing_table', _pass_table),
+]
+
+
+def _run_passes(rules, trace_memory):
+    st = {'rules': rules}
+    timings = {}
+    peaks = {}
+    for name, fn in PASSES:
+        if trace_memory:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+        t0 = time.perf_counter()
+        fn(st)
+        timings[name] = time.perf_counter() - t0
+        if trace_memory:
+            peaks[name] = tracemalloc.get_traced_memory()[1] - before
+    return timings, peaks
+
+
+def bench_grammar(rules, repeat=3):
+    """
+    Returns {pass: {'seconds': best wall time, 'peak_bytes': peak allocation during the pass}}.
+    Timings come from untraced runs; memory from one extra run under tracemalloc.
+    """
+    best = {}
+    for _ in range(repeat):
+        timings, _ = _run_passes(rules, trace_memory=False)
+        for name, t in timings.items():
+            best[name] = min(t, best.get(name, t))
+    tracemalloc.start()
+    try:
+        _, peaks = _run_passes(rules, trace_memory=True)
+    finally:
+        tracemalloc.stop()
+    return {name: {'seconds': best[name], 'peak_bytes': peaks[name]} for name, _ in PASSES}
+
+
+def run_benchmarks(kinds, sizes, seed=0, repeat=3, verbose=True):
+    results = []
+    for kind in kinds:
+        if verbose:
+            print(f"\n--- {kind} ---")
+            print(f"{'size':>7}  {'pass':<26}{'time (ms)':>12}{'peak (KiB)':>13}")
+        for size in sizes:
+            rules = generate_grammar(kind, size, seed)
+            per_pass = bench_grammar(rules, repeat)
+            results.append({'kind': kind, 'size': size, 'rules': len(rules), 'passes': per_pass})
+            if verbose:
+                for name, m in per_pass.items():
+                    print(f"{size:>7}  {name:<26}{m['seconds'] * 1000:>12.3f}{m['peak_bytes'] / 1024:>13.1f}")
+    return results
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Benchmark the ccl_8 grammar passes.")
+    ap.add_argument('--kinds', nargs='+', default=sorted(GENERATORS), choices=sorted(GENERATORS))
+    ap.add_argument('--sizes', nargs='+', type=int, default=[10, 50, 200])
+    ap.add_argument('--seed', type=int, default=0)
+    ap.add_argument('--repeat', type=int, default=3)
+    ap.add_argument('--json', help="also write the raw results here")
+    args = ap.parse_args()
+
+    results = run_benchmarks(args.kinds, args.sizes, args.seed, args.repeat)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
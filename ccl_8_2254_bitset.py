@@ -0,0 +1,361 @@
+# ----------------------------
+# Bitset engine for FIRST / FOLLOW (optional NumPy; falls back to the set-based passes).
+#
+# Nonterminals and terminals are interned to column numbers and every set becomes a bit row.
+# Both problems are then "direct bits, plus everything reachable through an inclusion graph":
+#   FIRST(A)  = direct(A)  | FIRST(B)  for each B that can start A   (after nullable prefixes)
+#   FOLLOW(B) = direct(B)  | FOLLOW(A) for each A -> ... B beta with beta nullable
+# so each is one transitive closure of an inclusion graph applied to packed uint64 bit rows.
+# Nonterminals in one strongly connected component always have equal sets, so the graph is
+# first condensed (Tarjan) and the closure runs per component:
+#   'topo'     - components in reverse topological order, each row ORed with its successors'
+#                rows in one NumPy reduction; linear in the condensed edges (default)
+#   'warshall' - Warshall's algorithm on [component bits | set bits] rows; pivot k ORs row k
+#                into every row that has bit k, as one NumPy operation per pivot
+#   'matmul'   - closure by repeated squaring of (I + E) as float32 matrix products, then one
+#                product with the set bits (BLAS does the work; memory is c x c floats)
+# Nullability is still a linear worklist pass in Python. Results equal compute_first_sets /
+# compute_follow_sets exactly, including their handling of a literal 'ε' token inside a body.
+#
+# usage: python ccl_8_2254_bitset.py [--kinds cycle,nullable] [--sizes 250,500,1000] [--method topo|warshall|matmul|all]
+#                                   [--skip-sets]
+# ----------------------------
+from collections import defaultdict
+
+from ccl_8_2254_main import EPSILON, compute_first_sets, compute_follow_sets
+
+try:
+    import numpy as np
+except ImportError:         # pure-Python fallback below
+    np = None
+
+HAVE_NUMPY = np is not None
+METHODS = ('topo', 'warshall', 'matmul')
+
+
+def _nullable(grammar_tokens):
+    """Nonterminals whose FIRST contains ε (a literal 'ε' token or a terminal blocks)."""
+    nullable = set()
+    waiting = defaultdict(list)     # B -> [(A, remaining count cell)] still waiting on B
+    queue = []
+    for A, prods in grammar_tokens.items():
+        for prod in prods:
+            if any(tok not in grammar_tokens for tok in prod):
+                continue
+            if not prod:
+                if A not in nullable:
+                    nullable.add(A)
+                    queue.append(A)
+                continue
+            cell = [len(prod)]
+            for tok in prod:
+                waiting[tok].append((A, cell))
+    while queue:
+        B = queue.pop()
+        for A, cell in waiting.pop(B, ()):
+            cell[0] -= 1
+            if cell[0] == 0 and A not in nullable:
+                nullable.add(A)
+                queue.append(A)
+    return nullable
+
+
+def _visible(seq, start, nullable, eps_in_first=True):
+    """
+    (symbols of seq[start:] that contribute to its FIRST, whole suffix nullable?, stopped at a
+    literal 'ε' token?). Like first_of_sequence, a literal 'ε' ends the walk: as a symbol with
+    an empty FIRST when FIRST has an 'ε' key (compute_first_sets only creates it when it
+    reaches one), otherwise as an unknown symbol that contributes itself, i.e. ε.
+    """
+    out = []
+    for tok in seq[start:]:
+        if tok == EPSILON:
+            return out, not eps_in_first, True
+        out.append(tok)
+        if tok not in nullable:
+            return out, False, False
+    return out, True, False
+
+
+class _Bits:
+    """rows x cols bit matrix, packed little-endian into uint64 words."""
+
+    def __init__(self, rows, cols):
+        self.cols = cols
+        self.m = np.zeros((rows, (cols + 63) >> 6), dtype=np.uint64)
+
+    def set(self, rows, cols):
+        if len(rows):
+            rows = np.asarray(rows, dtype=np.intp)
+            cols = np.asarray(cols, dtype=np.uint64)
+            np.bitwise_or.at(self.m, (rows, (cols >> np.uint64(6)).astype(np.intp)),
+                             np.left_shift(np.uint64(1), cols & np.uint64(63)))
+
+    def or_rows(self, dst, src, other, chunk=1 << 15):
+        """self[dst[i]] |= other[src[i]] for every i."""
+        dst = np.asarray(dst, dtype=np.intp)
+        src = np.asarray(src, dtype=np.intp)
+        for lo in range(0, len(dst), chunk):
+            np.bitwise_or.at(self.m, dst[lo:lo + chunk], other.m[src[lo:lo + chunk]])
+
+    def to_bool(self):
+        return np.unpackbits(self.m.view(np.uint8), axis=1, count=self.cols, bitorder='little').astype(bool)
+
+    @classmethod
+    def from_bool(cls, b):
+        bits = cls(b.shape[0], b.shape[1])
+        packed = np.packbits(b, axis=1, bitorder='little')
+        view = bits.m.view(np.uint8)
+        view[:, :packed.shape[1]] = packed
+        return bits
+
+
+def _components(n, adj):
+    """
+    Tarjan's SCCs, iteratively. Returns (component id per node, count); ids are handed out as
+    components complete, so every edge goes to an equal or smaller id (sinks first).
+    """
+    index = [-1] * n
+    low = [0] * n
+    comp = [-1] * n
+    on_stack = [False] * n
+    stack = []
+    counter = 0
+    ncomp = 0
+    for root in range(n):
+        if index[root] >= 0:
+            continue
+        work = [(root, 0)]
+        while work:
+            v, i = work.pop()
+            if i == 0:
+                index[v] = low[v] = counter
+                counter += 1
+                stack.append(v)
+                on_stack[v] = True
+            succ = adj[v]
+            while i < len(succ):
+                w = succ[i]
+                i += 1
+                if index[w] < 0:
+                    work.append((v, i))
+                    work.append((w, 0))
+                    break
+                if on_stack[w]:
+                    low[v] = min(low[v], index[w])
+            else:
+                if low[v] == index[v]:
+                    while True:
+                        w = stack.pop()
+                        on_stack[w] = False
+                        comp[w] = ncomp
+                        if w == v:
+                            break
+                    ncomp += 1
+                if work:
+                    u = work[-1][0]
+                    low[u] = min(low[u], low[v])
+    return comp, ncomp
+
+
+def _closure(n, edges, direct, method):
+    """
+    Row A of the result = direct(A) | direct(B) for every B reachable from A along edges.
+    edges: (src list, dst list) over 0..n-1; direct: _Bits with n rows.
+    Strongly connected nonterminals share one row, so the closure runs on the condensed graph.
+    """
+    adj = [[] for _ in range(n)]
+    for a, b in zip(*edges):
+        adj[a].append(b)
+    comp, ncomp = _components(n, adj)
+    comp = np.asarray(comp, dtype=np.intp)
+    rows = _Bits(ncomp, direct.cols)
+    np.bitwise_or.at(rows.m, comp, direct.m)
+    succ = [set() for _ in range(ncomp)]
+    for a, b in zip(*edges):
+        if comp[a] != comp[b]:
+            succ[comp[a]].add(comp[b])
+
+    if method == 'topo':
+        # successors always have smaller ids, so one sweep in id order finishes every row
+        R = rows.m
+        for c in range(ncomp):
+            if succ[c]:
+                R[c] |= np.bitwise_or.reduce(R[list(succ[c])], axis=0)
+    elif method == 'matmul':
+        E = np.zeros((ncomp, ncomp), dtype=np.float32)
+        for c, targets in enumerate(succ):
+            E[c, list(targets)] = 1
+        np.fill_diagonal(E, 1)
+        while True:
+            E2 = ((E @ E) > 0).astype(np.float32)
+            if np.array_equal(E2, E):
+                break
+            E = E2
+        rows = _Bits.from_bool((E @ rows.to_bool().astype(np.float32)) > 0)
+    else:
+        # Warshall on [component bits | direct bits]; the direct part starts on a word boundary
+        wn = (ncomp + 63) >> 6
+        graph = _Bits(ncomp, ncomp)
+        pairs = [(c, t) for c, targets in enumerate(succ) for t in targets]
+        graph.set([p[0] for p in pairs], [p[1] for p in pairs])
+        M = np.hstack([graph.m, rows.m])
+        for k in range(ncomp):
+            hits = np.flatnonzero(M[:, k >> 6] & np.uint64(1 << (k & 63)))
+            if hits.size:
+                M[hits] |= M[k]
+        rows.m = np.ascontiguousarray(M[:, wn:])
+
+    out = _Bits(n, direct.cols)
+    out.m = rows.m[comp]
+    return out
+
+
+def _rows_to_sets(bits, names):
+    names = np.array(names, dtype=object)
+    made = {}       # equal rows (e.g. one strongly connected component) decode once, then copy
+    out = []
+    for packed, row in zip(bits.m, bits.to_bool()):
+        key = packed.tobytes()
+        s = made.get(key)
+        if s is None:
+            s = made[key] = set(names[np.flatnonzero(row)])
+        out.append(s.copy())
+    return out
+
+
+def compute_first_follow_bitset(grammar_tokens, start_symbol, method='topo'):
+    """
+    (FIRST, FOLLOW) with the same contents as compute_first_sets / compute_follow_sets.
+    Without NumPy this simply runs those passes.
+    """
+    if method not in METHODS:
+        raise ValueError(f"unknown method {method!r}; expected one of {METHODS}")
+    if np is None:
+        FIRST = compute_first_sets(grammar_tokens)
+        return FIRST, compute_follow_sets(grammar_tokens, FIRST, start_symbol)
+
+    nts = list(grammar_tokens)
+    nt_id = {A: i for i, A in enumerate(nts)}
+    terminals = []
+    t_id = {}
+    for prods in grammar_tokens.values():
+        for prod in prods:
+            for tok in prod:
+                if tok in nt_id:
+                    continue
+                if tok != EPSILON and tok not in t_id:
+                    t_id[tok] = len(terminals)
+                    terminals.append(tok)
+    # FOLLOW needs one more column for '$' (unless '$' is already a terminal)
+    end_col = t_id.get('$', len(terminals))
+    cols = max(len(terminals), end_col + 1)
+    n = len(nts)
+    nullable = _nullable(grammar_tokens)
+
+    # ---------- FIRST ----------
+    e_src, e_dst, d_row, d_col = [], [], [], []
+    eps_reached = False
+    for A, prods in grammar_tokens.items():
+        a = nt_id[A]
+        for prod in prods:
+            vis, _, hit_eps = _visible(prod, 0, nullable)
+            eps_reached = eps_reached or hit_eps
+            for tok in vis:
+                if tok in nt_id:
+                    e_src.append(a)
+                    e_dst.append(nt_id[tok])
+                else:
+                    d_row.append(a)
+                    d_col.append(t_id[tok])
+    direct = _Bits(n, cols)
+    direct.set(d_row, d_col)
+    first_bits = _closure(n, (e_src, e_dst), direct, method)
+
+    # ---------- FOLLOW ----------
+    e_src, e_dst, d_row, d_col, via_dst, via_src = [], [], [], [], [], []
+    if start_symbol in nt_id:
+        d_row.append(nt_id[start_symbol])
+        d_col.append(end_col)
+    for A, prods in grammar_tokens.items():
+        a = nt_id[A]
+        for prod in prods:
+            for i, B in enumerate(prod):
+                if B not in nt_id:
+                    continue
+                b = nt_id[B]
+                vis, beta_nullable, _ = _visible(prod, i + 1, nullable, eps_reached)
+                for tok in vis:
+                    if tok in nt_id:
+                        via_dst.append(b)
+                        via_src.append(nt_id[tok])
+                    else:
+                        d_row.append(b)
+                        d_col.append(t_id[tok])
+                if beta_nullable:
+                    e_src.append(b)
+                    e_dst.append(a)
+    # FIRST(beta) - ε of the nonterminals in beta goes in as direct bits
+    direct = _Bits(n, cols)
+    direct.set(d_row, d_col)
+    direct.or_rows(via_dst, via_src, first_bits)
+    follow_bits = _closure(n, (e_src, e_dst), direct, method)
+
+    # ---------- back to sets ----------
+    col_names = list(terminals)
+    while len(col_names) < cols:
+        col_names.append('$')
+    FIRST = defaultdict(set)
+    for t in terminals:
+        FIRST[t].add(t)
+    if eps_reached:
+        FIRST[EPSILON] = set()
+    for A, s in zip(nts, _rows_to_sets(first_bits, col_names)):
+        if A in nullable:
+            s.add(EPSILON)
+        FIRST[A] = s
+    FOLLOW = dict(zip(nts, _rows_to_sets(follow_bits, col_names)))
+    return FIRST, FOLLOW
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+    from ccl_8_2254_grammar_gen import GENERATORS, generate_grammar
+    from ccl_8_2254_main import build_tokenized_grammar, detect_left_recursion
+
+    ap = argparse.ArgumentParser(description="Compare the set-based and bitset FIRST/FOLLOW engines.")
+    ap.add_argument('--kinds', default='cycle,nullable', help=f"comma-separated, from {', '.join(sorted(GENERATORS))}")
+    ap.add_argument('--sizes', default='250,500,1000')
+    ap.add_argument('--method', choices=METHODS + ('all',), default='topo')
+    ap.add_argument('--seed', type=int, default=0)
+    ap.add_argument('--skip-sets', action='store_true',
+                    help="do not run (or compare with) the set-based engine; for sizes where it takes minutes")
+    args = ap.parse_args()
+
+    methods = METHODS if args.method == 'all' else (args.method,)
+    if not HAVE_NUMPY:
+        print("NumPy not available: the bitset engine falls back to the set-based passes.")
+    print(f"\n{'grammar':<18}{'NTs':>7}{'terms':>7}{'sets (s)':>10}" +
+          ''.join(f"{m + ' (s)':>15}" for m in methods) + "  same")
+    for kind in args.kinds.split(','):
+        for size in (int(s) for s in args.sizes.split(',')):
+            parsed, _ = detect_left_recursion(generate_grammar(kind, size, args.seed), verbose=False)
+            grammar_tokens, _, nonterminals, terminals = build_tokenized_grammar(parsed)
+            start = parsed[0][0]
+            row = f"{kind + ' ' + str(size):<18}{len(nonterminals):>7}{len(terminals):>7}"
+            if args.skip_sets:
+                row += f"{'-':>10}"
+            else:
+                t0 = time.perf_counter()
+                FIRST = compute_first_sets(grammar_tokens)
+                FOLLOW = compute_follow_sets(grammar_tokens, FIRST, start)
+                row += f"{time.perf_counter() - t0:>10.3f}"
+            same = True
+            for m in methods:
+                t0 = time.perf_counter()
+                bF, bFo = compute_first_follow_bitset(grammar_tokens, start, m)
+                row += f"{time.perf_counter() - t0:>15.3f}"
+                if not args.skip_sets:
+                    same = same and dict(bF) == dict(FIRST) and bFo == FOLLOW
+            print(row + ("  -" if args.skip_sets else "  yes" if same else "  NO"))
@@ -0,0 +1,120 @@
+# ----------------------------
+# Seeded synthetic grammar generator (stress inputs for the ccl_8 passes).
+# Output is a list of rule lines in the same 'A -> x | y' form the scripts read from stdin.
+# Productions are space-tokenized and nonterminal names are zero-padded, so no name is a
+# prefix of another (detect_left_recursion uses str.startswith).
+# ----------------------------
+import random
+
+_OPERATORS = ['+', '-', '*', '/', '%', '<<', '>>', '<', '>', '==', '!=', '&', '^', '&&', 'or', 'and']
+_ATOMS = ['id', 'num', 'str', 'chr']
+
+
+def _nt(prefix, i):
+    return f"{prefix}{i:05d}"
+
+
+def _rule(lhs, prods):
+    return f"{lhs} -> " + " | ".join(prods)
+
+
+def expression_chain(depth, seed=0):
+    """
+    Precedence chain E0 -> E0 op E1 | E1, ..., one level per operator tier, ending in atoms
+    and a parenthesised E0. Every level is immediately left recursive.
+    """
+    rng = random.Random(seed)
+    rules = []
+    for i in range(depth):
+        cur, nxt = _nt('E', i), _nt('E', i + 1)
+        ops = rng.sample(_OPERATORS, rng.randint(1, 3))
+        prods = [f"{cur} {op} {nxt}" for op in ops] + [nxt]
+        rules.append(_rule(cur, prods))
+    last = _nt('E', depth)
+    atoms = rng.sample(_ATOMS, rng.randint(1, len(_ATOMS)))
+    rules.append(_rule(last, [f"( {_nt('E', 0)} )"] + atoms))
+    return rules
+
+
+def wide_alternatives(width, seed=0, shared=8, prefix_len=3):
+    """
+    One nonterminal with `width` alternatives drawn from `shared` common prefixes of up to
+    `prefix_len` tokens, the case removal_left_factoring has to split repeatedly.
+    """
+    rng = random.Random(seed)
+    prefixes = []
+    for g in range(shared):
+        n = rng.randint(1, prefix_len)
+        prefixes.append([f"k{g}_{j}" for j in range(n)])
+    prods = []
+    seen = set()
+    for i in range(width):
+        prefix = prefixes[rng.randrange(shared)]
+        tail = [f"t{rng.randrange(width)}" for _ in range(rng.randint(1, 3))]
+        prod = ' '.join(prefix + tail + [f"u{i}"])
+        if prod not in seen:
+            seen.add(prod)
+            prods.append(prod)
+    return [_rule('S', prods)]
+
+
+def nullable_chain(length, seed=0):
+    """
+    N0 -> N1 t0 | ε, N1 -> N2 t1 | ε, ...; every level is nullable so FIRST and FOLLOW
+    have to propagate through the whole chain.
+    """
+    rng = random.Random(seed)
+    rules = [_rule('S', [f"{_nt('N', 0)} end"])]
+    for i in range(length):
+        cur, nxt = _nt('N', i), _nt('N', i + 1)
+        prods = [f"{nxt} t{i}", 'ε']
+        if rng.random() < 0.3:
+            prods.insert(1, f"{nxt} {nxt} s{i}")
+        rules.append(_rule(cur, prods))
+    rules.append(_rule(_nt('N', length), ['z', 'ε']))
+    return rules
+
+
+def indirect_cycle(size, seed=0):
+    """
+    A0 -> A1 a0 | b0, A1 -> A2 a1 | b1, ..., A(n-1) -> A0 a | b: one left-recursion
+    cycle through every nonterminal, none of it immediate.
+    """
+    rng = random.Random(seed)
+    rules = []
+    for i in range(size):
+        cur, nxt = _nt('A', i), _nt('A', (i + 1) % size)
+        prods = [f"{nxt} a{i}", f"b{i}"]
+        if rng.random() < 0.2:
+            prods.append(f"c{i} {nxt}")
+        rules.append(_rule(cur, prods))
+    return rules
+
+
+GENERATORS = {
+    'expression': expression_chain,
+    'wide': wide_alternatives,
+    'nullable': nullable_chain,
+    'cycle': indirect_cycle,
+}
+
+
+def generate_grammar(kind, size, seed=0):
+    return GENERATORS[kind](size, seed=seed)
+
+
+# ----------------------------
+# CLI: print one generated grammar in stdin format (count line first)
+# ----------------------------
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="Generate a synthetic stress grammar.")
+    ap.add_argument('kind', choices=sorted(GENERATORS))
+    ap.add_argument('size', type=int)
+    ap.add_argument('--seed', type=int, default=0)
+    args = ap.parse_args()
+
+    rules = generate_grammar(args.kind, args.size, args.seed)
+    print(len(rules))
+    for r in rules:
+        print(r)
@@ -0,0 +1,216 @@
+# ----------------------------
+# LL(k) lookahead check for the nonterminals that conflict at k = 1.
+#
+# FIRST_k / FOLLOW_k are computed only on the part of the grammar those nonterminals need:
+#   - FIRST_k for symbols reachable from their productions and from the suffixes that follow
+#     them elsewhere, and
+#   - FOLLOW_k for them plus every head that (transitively) contains them.
+# Terminals are interned to small ints and every k-prefix is an interned tuple of ints, so
+# equal prefixes are stored once however many sets contain them.
+# A nonterminal is resolved at k when the strong-LL(k) lookahead sets
+#   LA_k(A -> alpha) = FIRST_k(alpha FOLLOW_k(A))
+# of its productions are pairwise disjoint.
+#
+# usage: python ccl_8_2254_llk.py grammar.txt [--max-k 3]
+# ----------------------------
+from ccl_8_2254_main import EPSILON
+
+
+class _Interner:
+    def __init__(self):
+        self.ids = {'$': 0}
+        self.names = ['$']
+        self.prefixes = {}
+
+    def terminal(self, name):
+        tid = self.ids.get(name)
+        if tid is None:
+            tid = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return tid
+
+    def prefix(self, tup):
+        return self.prefixes.setdefault(tup, tup)
+
+    def show(self, tup):
+        return ' '.join(self.names[t] for t in tup) or EPSILON
+
+
+_END = 0
+
+
+def _concat_k(X, Y, k, intern):
+    """{(x + y)[:k]} with x in X, y in Y; x that is already complete passes through."""
+    out = set()
+    for x in X:
+        if len(x) >= k or (x and x[-1] == _END):
+            out.add(x)
+            continue
+        need = k - len(x)
+        for y in Y:
+            out.add(intern.prefix(x + y[:need]))
+    return out
+
+
+class _LLkSolver:
+    def __init__(self, grammar_tokens, start_symbol, k, intern):
+        self.grammar = grammar_tokens
+        self.start = start_symbol
+        self.k = k
+        self.intern = intern
+        self.first = {}
+        self.follow = {}
+        # heads[B] = productions (H, prod) that mention B
+        self.heads = {}
+        for H, prods in grammar_tokens.items():
+            for prod in prods:
+                for tok in set(prod):
+                    if tok in grammar_tokens:
+                        self.heads.setdefault(tok, []).append((H, prod))
+
+    def first_of_seq(self, seq):
+        k, intern = self.k, self.intern
+        result = {()}
+        for tok in seq:
+            if tok == EPSILON:
+                continue
+            if tok in self.grammar:
+                sym = self.first[tok]
+            else:
+                sym = {intern.prefix((intern.terminal(tok),))}
+            result = _concat_k(result, sym, k, intern)
+            if all(len(x) >= k for x in result):
+                break
+        return result
+
+    def solve(self, targets):
+        # FOLLOW_k is needed for the targets and every head containing them, transitively
+        follow_needed = set(targets)
+        stack = list(targets)
+        while stack:
+            B = stack.pop()
+            for H, _ in self.heads.get(B, ()):
+                if H not in follow_needed:
+                    follow_needed.add(H)
+                    stack.append(H)
+
+        # FIRST_k is needed for every nonterminal reachable from the sequences we evaluate
+        first_needed = set()
+        stack = []
+        def need_seq(seq):
+            for tok in seq:
+                if tok in self.grammar and tok not in first_needed:
+                    first_needed.add(tok)
+                    stack.append(tok)
+        for A in targets:
+            for prod in self.grammar[A]:
+                need_seq(prod)
+        for B in follow_needed:
+            for H, prod in self.heads.get(B, ()):
+                need_seq(prod)
+        while stack:
+            X = stack.pop()
+            for prod in self.grammar[X]:
+                need_seq(prod)
+
+        for X in first_needed:
+            self.first[X] = set()
+        changed = True
+        while changed:
+            changed = False
+            for X in first_needed:
+                cur = self.first[X]
+                before = len(cur)
+                for prod in self.grammar[X]:
+                    cur |= self.first_of_seq(prod)
+                if len(cur) != before:
+                    changed = True
+
+        for B in follow_needed:
+            self.follow[B] = {(_END,)} if B == self.start else set()
+        changed = True
+        while changed:
+            changed = False
+            for B in follow_needed:
+                cur = self.follow[B]
+                before = len(cur)
+                for H, prod in self.heads.get(B, ()):
+                    for i, tok in enumerate(prod):
+                        if tok == B:
+                            cur |= _concat_k(self.first_of_seq(prod[i+1:]), self.follow[H], self.k, self.intern)
+                if len(cur) != before:
+                    changed = True
+        return len(first_needed), len(follow_needed)
+
+    def lookaheads(self, A):
+        return [(prod, _concat_k(self.first_of_seq(prod), self.follow[A], self.k, self.intern))
+                for prod in self.grammar[A]]
+
+
+def llk_analysis(grammar_tokens, start_symbol, conflicts, max_k=3):
+    """
+    conflicts: the list construct_parsing_table returns ([(A, a, prod1, prod2), ...]).
+    Returns {A: {'k': smallest k in 2..max_k that resolves A (None if none does),
+                 'overlaps': [(prod1, prod2, [shared k-prefixes...]), ...] at the last k tried,
+                 'first_k_symbols': ..., 'follow_k_symbols': ...}}
+    """
+    targets = []
+    for A, _, _, _ in conflicts:
+        if A not in targets:
+            targets.append(A)
+    results = {A: {'k': None, 'overlaps': []} for A in targets}
+    pending = list(targets)
+    intern = _Interner()
+    for k in range(2, max_k + 1):
+        if not pending:
+            break
+        solver = _LLkSolver(grammar_tokens, start_symbol, k, intern)
+        n_first, n_follow = solver.solve(pending)
+        still = []
+        for A in pending:
+            la = solver.lookaheads(A)
+            overlaps = []
+            for i in range(len(la)):
+                for j in range(i + 1, len(la)):
+                    shared = la[i][1] & la[j][1]
+                    if shared and la[i][0] != la[j][0]:
+                        overlaps.append((la[i][0], la[j][0], sorted(intern.show(t) for t in shared)))
+            results[A].update({'overlaps': overlaps, 'first_k_symbols': n_first, 'follow_k_symbols': n_follow})
+            if overlaps:
+                still.append(A)
+            else:
+                results[A]['k'] = k
+        pending = still
+    return results
+
+
+def pretty_print_llk(results, total_nonterminals, max_k):
+    print(f"\n--- LL(k) analysis of LL(1) conflicts (k <= {max_k}) ---")
+    if not results:
+        print("Grammar is LL(1); nothing to analyse.")
+        return
+    for A, res in results.items():
+        if res['k'] is not None:
+            print(f"{A}: resolved with {res['k']} tokens of lookahead")
+        else:
+            print(f"{A}: still conflicting at k = {max_k}")
+            for p1, p2, shared in res['overlaps']:
+                print(f"    {A} -> {' '.join(p1) or EPSILON}  vs  {A} -> {' '.join(p2) or EPSILON}: "
+                      f"{{ {', '.join(shared)} }}")
+        print(f"    (FIRST_k on {res.get('first_k_symbols', 0)} / FOLLOW_k on "
+              f"{res.get('follow_k_symbols', 0)} of {total_nonterminals} nonterminals)")
+
+
+if __name__ == "__main__":
+    import argparse
+    from ccl_8_2254_batch import read_grammar_file
+    from ccl_8_2254_main import analyse_grammar
+
+    ap = argparse.ArgumentParser(description="Check whether LL(1) conflicts go away with more lookahead.")
+    ap.add_argument('grammar', help="grammar file ('A -> x | y' per line)")
+    ap.add_argument('--max-k', type=int, default=3)
+    args = ap.parse_args()
+
+    res = analyse_grammar(read_grammar_file(args.grammar))
+    results = llk_analysis(res['grammar_tokens'], res['start_symbol'], res['conflicts'], args.max_k)
+    pretty_print_llk(results, len(res['grammar_tokens']), args.max_k)
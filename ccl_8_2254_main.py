@@ -2,11 +2,45 @@
 # Functions (left recursion + left factoring + FIRST only)
 # Duplicate outputs removed by quiet detection inside removal loop.
 # ----------------------------
-from collections import defaultdict
+import functools
+import sys
+from collections import OrderedDict, defaultdict
+
+# ---------- Optional profiling hooks (see ccl_8_2254_profile.py) ----------
+_profiler = None
+
+def enable_profiling(trace_memory=True):
+    global _profiler
+    from ccl_8_2254_profile import PassProfiler
+    disable_profiling()
+    _profiler = PassProfiler(trace_memory)
+    return _profiler
+
+def disable_profiling():
+    global _profiler
+    if _profiler is not None:
+        _profiler.close()
+    _profiler = None
+
+def _profiled_pass(fn):
+    # With profiling off the only cost is the `_profiler is None` check per pass call.
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if _profiler is None:
+            return fn(*args, **kwargs)
+        _profiler.start_pass(fn.__name__)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _profiler.end_pass(fn.__name__)
+    return wrapper
+
 
 # ---------- Left recursion functions ----------
-def detect_left_recursion(rules_lines):
-    print("\n--- Left Recursion Detection Result ---")
+@_profiled_pass
+def detect_left_recursion(rules_lines, verbose=True):
+    if verbose:
+        print("\n--- Left Recursion Detection Result ---")
     left_recursive_count = 0
     parsed_rules = []
 
@@ -21,15 +55,17 @@ def detect_left_recursion(rules_lines):
                 left_recursive_prods.append(prod)
 
         if left_recursive_prods:
-            print(f"{non_terminal} has {len(left_recursive_prods)} left recursive production(s):")
-            for p in left_recursive_prods:
-                print(f"{non_terminal} → {p}")
+            if verbose:
+                print(f"{non_terminal} has {len(left_recursive_prods)} left recursive production(s):")
+                for p in left_recursive_prods:
+                    print(f"{non_terminal} → {p}")
             left_recursive_count += 1
-        else:
+        elif verbose:
             print(f"{non_terminal} has no left recursion.")
         parsed_rules.append((non_terminal, productions))
 
-    print(f"\nTotal rules with left recursion: {left_recursive_count}")
+    if verbose:
+        print(f"\nTotal rules with left recursion: {left_recursive_count}")
     return parsed_rules, left_recursive_count
 
 
@@ -90,6 +126,7 @@ def _tokenize(prod, char_mode, nonterminals=None):
 
 def _build_trie_with_mode(productions, char_mode, nonterminals=None):
     root = _TrieNode()
+    nodes = 1
     for p in productions:
         tokens = _tokenize(p, char_mode, nonterminals)
         node = root
@@ -97,8 +134,12 @@ def _build_trie_with_mode(productions, char_mode, nonterminals=None):
         for t in tokens:
             if t not in node.children:
                 node.children[t] = _TrieNode()
+                nodes += 1
             node = node.children[t]
             node.prods.append(p)
+    if _profiler is not None:
+        _profiler.count('trie_nodes', nodes)
+        _profiler.count('productions_tokenized', len(productions))
     return root
 
 def _collect_maximal_prefixes(root):
@@ -117,13 +158,92 @@ def _collect_maximal_prefixes(root):
     dfs(root, [])
     return results
 
-def detection_left_factoring(parsed_rules, verbose=True):
+def _lcp_factoring_groups(productions, char_mode, nonterminals=None):
+    """
+    Same result as _collect_maximal_prefixes(_build_trie_with_mode(...)), without a trie:
+    sort the token lists once, take the longest-common-prefix array of sorted neighbours and
+    walk its lcp-interval tree. A trie node with >= 2 productions is an lcp-interval; the
+    groups are the intervals (lcp >= 1) that contain no smaller interval. Children are visited
+    in order of their smallest production index, which is the order the trie inserted them.
+    """
+    token_lists = [tuple(_tokenize(p, char_mode, nonterminals)) for p in productions]
+    n = len(token_lists)
+    if _profiler is not None:
+        _profiler.count('productions_tokenized', n)
+    if n < 2:
+        return []
+    order = sorted(range(n), key=token_lists.__getitem__)
+    lcp = [0] * (n + 1)       # lcp[i] between order[i-1] and order[i]; lcp[0] = lcp[n] = 0
+    for i in range(1, n):
+        a, b = token_lists[order[i - 1]], token_lists[order[i]]
+        m = min(len(a), len(b))
+        k = 0
+        while k < m and a[k] == b[k]:
+            k += 1
+        lcp[i] = k
+
+    # bottom-up interval tree; an interval is [lcp value, lb, rb, children, min production index]
+    def close(iv, rb):
+        iv[2] = rb
+        lo = n
+        pos = iv[1]
+        for child in iv[3]:
+            for q in range(pos, child[1]):
+                lo = min(lo, order[q])
+            lo = min(lo, child[4])
+            pos = child[2] + 1
+        for q in range(pos, rb + 1):
+            lo = min(lo, order[q])
+        iv[4] = lo
+        iv[3].sort(key=lambda c: c[4])
+
+    root = [0, 0, n - 1, [], 0]
+    stack = [root]
+    intervals = 0
+    for i in range(1, n + 1):
+        cur = lcp[i]
+        lb = i - 1
+        last = None
+        while cur < stack[-1][0]:
+            last = stack.pop()
+            close(last, i - 1)
+            lb = last[1]
+            if cur <= stack[-1][0]:
+                stack[-1][3].append(last)
+                last = None
+        if cur > stack[-1][0]:
+            stack.append([cur, lb, -1, [last] if last is not None else [], -1])
+            intervals += 1
+    close(root, n - 1)
+    if _profiler is not None:
+        _profiler.count('lcp_intervals', intervals)
+
+    results = []
+    pending = [root]
+    while pending:
+        iv = pending.pop()
+        depth, lb, rb, children, _ = iv
+        if children:
+            pending.extend(reversed(children))
+        elif depth >= 1:
+            members = sorted(order[lb:rb + 1])
+            results.append((list(token_lists[order[lb]][:depth]), [productions[q] for q in members]))
+    return results
+
+FACTORING_ENGINES = ('trie', 'lcp')
+
+@_profiled_pass
+def detection_left_factoring(parsed_rules, verbose=True, engine='trie'):
     """
     parsed_rules: list of (non_terminal, [productions])
     Returns: factoring_map, total_groups
       factoring_map: {nt: (char_mode, [(prefix_tokens, [productions]), ...])}
     If verbose==True, prints detection output; otherwise returns data quietly.
+    engine: 'trie' (per-nonterminal prefix trie) or 'lcp' (sorted productions + LCP array,
+    no per-node objects; for nonterminals with very many alternatives). Groups are identical.
     """
+    if engine not in FACTORING_ENGINES:
+        raise ValueError(f"unknown factoring engine {engine!r}; expected one of {FACTORING_ENGINES}")
     factoring_map = {}
     total_groups = 0
 
@@ -134,8 +254,11 @@ def detection_left_factoring(parsed_rules, verbose=True):
             continue
 
         char_mode = _choose_char_mode(prods)
-        root = _build_trie_with_mode(prods, char_mode, None)
-        groups = _collect_maximal_prefixes(root)
+        if engine == 'lcp':
+            groups = _lcp_factoring_groups(prods, char_mode, None)
+        else:
+            root = _build_trie_with_mode(prods, char_mode, None)
+            groups = _collect_maximal_prefixes(root)
         if groups:
             factoring_map[nt] = (char_mode, groups)
             total_groups += len(groups)
@@ -165,12 +288,15 @@ def _unique_new_nt(base, existing_set):
     existing_set.add(cand)
     return cand
 
-def removal_left_factoring(parsed_rules):
+@_profiled_pass
+def removal_left_factoring(parsed_rules, verbose=True, engine='trie'):
     """
     Removes left factoring iteratively. Uses quiet detection internally (no repeated detection prints).
-    Prints per-change factoring info and final grammar.
+    Prints per-change factoring info and final grammar (only when verbose==True).
+    engine is passed on to detection_left_factoring.
     """
-    print("\n--- Left Factoring Removal Result ---")
+    if verbose:
+        print("\n--- Left Factoring Removal Result ---")
     grammar = {nt: list(prods) for nt, prods in parsed_rules}
     existing_nts = set(grammar.keys())
 
@@ -178,11 +304,13 @@ def removal_left_factoring(parsed_rules):
     while True:
         iteration += 1
         # QUIET detection to drive removal (prevents duplicate printed detection headers)
-        factoring_map, total_groups = detection_left_factoring(list(grammar.items()), verbose=False)
+        factoring_map, total_groups = detection_left_factoring(list(grammar.items()), verbose=False, engine=engine)
+        if _profiler is not None:
+            _profiler.count('factoring_removal_iterations')
         if total_groups == 0:
-            if iteration == 1:
+            if verbose and iteration == 1:
                 print("\nNo left factoring detected; no changes made.")
-            else:
+            elif verbose:
                 print("\nNo further left factoring to remove.")
             break
 
@@ -200,6 +328,8 @@ def removal_left_factoring(parsed_rules):
 
                 new_nt_prods = []
                 nt_set = set(grammar.keys()) | {new_nt}
+                if _profiler is not None:
+                    _profiler.count('productions_tokenized', len(to_factor))
                 for p in to_factor:
                     tokens = _tokenize(p, char_mode, nt_set if char_mode else None)
                     if len(tokens) >= len(prefix_tokens) and tokens[:len(prefix_tokens)] == prefix_tokens:
@@ -233,6 +363,8 @@ def removal_left_factoring(parsed_rules):
                         seen.add(x)
                 grammar[new_nt] = deduped
 
+                if not verbose:
+                    continue
                 # print per-change transformation (one-time per change)
                 display_prefix = ''.join(prefix_tokens) if char_mode else ' '.join(prefix_tokens)
                 print(f"\nFactoring applied on {nt}:")
@@ -242,10 +374,12 @@ def removal_left_factoring(parsed_rules):
                 print(f"  Introduced {new_nt} -> {', '.join(grammar[new_nt])}")
 
     # final grammar printout (printed once)
-    print("\n--- Grammar after left factoring removal ---")
+    if verbose:
+        print("\n--- Grammar after left factoring removal ---")
     final_rules = []
     for nt, prods in grammar.items():
-        print(f"{nt} -> " + " | ".join(prods))
+        if verbose:
+            print(f"{nt} -> " + " | ".join(prods))
         final_rules.append((nt, prods))
     return final_rules
 
@@ -254,6 +388,7 @@ def removal_left_factoring(parsed_rules):
 # FIRST (only) — FOLLOW & table kept but not called in main
 # ----------------------------
 
+@_profiled_pass
 def build_tokenized_grammar(parsed_rules):
     nonterminals = [nt for nt, _ in parsed_rules]
     char_mode_map = {}
@@ -270,8 +405,10 @@ def build_tokenized_grammar(parsed_rules):
                 tokens = _tokenize(p, True, current_nts)
             else:
                 tokens = _tokenize(p, False, None)
-            tokenized_prods.append(tokens)
+            tokenized_prods.append([sys.intern(t) for t in tokens])
         grammar_tokens[nt] = tokenized_prods
+        if _profiler is not None:
+            _profiler.count('productions_tokenized', len(prods))
 
     terminals = set()
     for nt, prods in grammar_tokens.items():
@@ -283,8 +420,205 @@ def build_tokenized_grammar(parsed_rules):
                     terminals.add(tok)
     return grammar_tokens, char_mode_map, set(grammar_tokens.keys()), terminals
 
+# ---------- Grammar reduction (runs before FIRST / table) ----------
+def _dedupe_prods(prods):
+    seen = set()
+    deduped = []
+    for p in prods:
+        key = tuple(p)
+        if key not in seen:
+            seen.add(key)
+            deduped.append(list(p))
+    return deduped
+
+def _nullable_nonterminals(grammar_tokens):
+    """
+    Linear worklist: every production keeps a count of symbols not yet known nullable.
+    Terminals are never nullable, so any production containing one is skipped outright.
+    """
+    remaining = []
+    occurrences = defaultdict(list)
+    nullable = set()
+    queue = []
+    for A, prods in grammar_tokens.items():
+        for prod in prods:
+            if any(tok not in grammar_tokens for tok in prod):
+                continue
+            idx = len(remaining)
+            remaining.append([A, len(prod)])
+            for tok in prod:
+                occurrences[tok].append(idx)
+            if not prod and A not in nullable:
+                nullable.add(A)
+                queue.append(A)
+    while queue:
+        B = queue.pop()
+        for idx in occurrences[B]:
+            entry = remaining[idx]
+            entry[1] -= 1
+            if entry[1] == 0 and entry[0] not in nullable:
+                nullable.add(entry[0])
+                queue.append(entry[0])
+    return nullable
+
+def _generating_nonterminals(grammar_tokens):
+    remaining = []
+    occurrences = defaultdict(list)
+    generating = set()
+    queue = []
+    for A, prods in grammar_tokens.items():
+        for prod in prods:
+            idx = len(remaining)
+            count = 0
+            for tok in prod:
+                if tok in grammar_tokens:
+                    occurrences[tok].append(idx)
+                    count += 1
+            remaining.append([A, count])
+            if count == 0 and A not in generating:
+                generating.add(A)
+                queue.append(A)
+    while queue:
+        B = queue.pop()
+        for idx in occurrences[B]:
+            entry = remaining[idx]
+            entry[1] -= 1
+            if entry[1] == 0 and entry[0] not in generating:
+                generating.add(entry[0])
+                queue.append(entry[0])
+    return generating
+
+def _reachable_nonterminals(grammar_tokens, start_symbol):
+    if start_symbol not in grammar_tokens:
+        return set()
+    reachable = {start_symbol}
+    stack = [start_symbol]
+    while stack:
+        A = stack.pop()
+        for prod in grammar_tokens[A]:
+            for tok in prod:
+                if tok in grammar_tokens and tok not in reachable:
+                    reachable.add(tok)
+                    stack.append(tok)
+    return reachable
+
+def _eliminate_epsilon(grammar_tokens, start_symbol, removed):
+    nullable = _nullable_nonterminals(grammar_tokens)
+    result = {}
+    for A, prods in grammar_tokens.items():
+        expanded = []
+        for prod in prods:
+            if not prod:
+                removed.append((A, prod))
+                continue
+            variants = [[]]
+            for tok in prod:
+                with_tok = [v + [tok] for v in variants]
+                if tok in nullable:
+                    variants = variants + with_tok
+                else:
+                    variants = with_tok
+            expanded.extend(v for v in variants if v)
+        if A == start_symbol and A in nullable:
+            expanded.append([])
+        result[A] = _dedupe_prods(expanded)
+    return result
+
+def _eliminate_unit(grammar_tokens, removed):
+    result = {}
+    for A, prods in grammar_tokens.items():
+        closure = [A]
+        seen = {A}
+        i = 0
+        while i < len(closure):
+            for prod in grammar_tokens[closure[i]]:
+                if len(prod) == 1 and prod[0] in grammar_tokens and prod[0] not in seen:
+                    seen.add(prod[0])
+                    closure.append(prod[0])
+            i += 1
+        new_prods = []
+        for B in closure:
+            for prod in grammar_tokens[B]:
+                if len(prod) == 1 and prod[0] in grammar_tokens:
+                    if B == A:
+                        removed.append((A, prod))
+                    continue
+                new_prods.append(prod)
+        result[A] = _dedupe_prods(new_prods)
+    return result
+
+@_profiled_pass
+def reduce_grammar(grammar_tokens, start_symbol, remove_epsilon=False, remove_unit=False, verbose=True):
+    """
+    grammar_tokens: {nt: [[tokens...], ...]} as built by build_tokenized_grammar
+    Removes non-generating and unreachable nonterminals (and optionally ε- and unit productions).
+    Returns: reduced_grammar_tokens, report
+      report: {'non_generating': [...], 'unreachable': [...],
+               'epsilon_removed': [(nt, prod)], 'unit_removed': [(nt, prod)]}
+    The start symbol is always kept (with no productions if its language is empty),
+    so FOLLOW / table construction can still run on the result.
+    """
+    report = {'non_generating': [], 'unreachable': [], 'epsilon_removed': [], 'unit_removed': []}
+    grammar = {nt: [list(p) for p in prods] for nt, prods in grammar_tokens.items()}
+
+    if remove_epsilon:
+        grammar = _eliminate_epsilon(grammar, start_symbol, report['epsilon_removed'])
+    if remove_unit:
+        grammar = _eliminate_unit(grammar, report['unit_removed'])
+
+    # 1) drop non-generating symbols and every production that mentions one
+    generating = _generating_nonterminals(grammar)
+    report['non_generating'] = [nt for nt in grammar if nt not in generating]
+    grammar = {
+        nt: [p for p in prods if all(tok in generating or tok not in grammar for tok in p)]
+        for nt, prods in grammar.items() if nt in generating
+    }
+
+    # 2) drop symbols unreachable from the start symbol (must run after step 1)
+    reachable = _reachable_nonterminals(grammar, start_symbol)
+    report['unreachable'] = [nt for nt in grammar if nt not in reachable]
+    grammar = {nt: prods for nt, prods in grammar.items() if nt in reachable}
+
+    if start_symbol is not None and start_symbol not in grammar:
+        grammar = {start_symbol: []}
+
+    if verbose:
+        print("\n--- Grammar Reduction Result ---")
+        print(f"Non-generating nonterminals removed: {', '.join(report['non_generating']) or 'none'}")
+        print(f"Unreachable nonterminals removed: {', '.join(report['unreachable']) or 'none'}")
+        if remove_epsilon:
+            print(f"ε-productions removed: {len(report['epsilon_removed'])}")
+        if remove_unit:
+            print(f"Unit productions removed: {len(report['unit_removed'])}")
+        for nt, prods in grammar.items():
+            shown = [' '.join(p) if p else EPSILON for p in prods]
+            print(f"{nt} -> " + " | ".join(shown))
+    return grammar, report
+
+class FirstSets(defaultdict):
+    """
+    FIRST map as returned by compute_first_sets: a defaultdict(set) with a version counter that
+    every item assignment or deletion bumps, so a FirstSequenceCache can tell that it moved.
+    Replace a set (FIRST[X] = new) rather than changing it in place once a cache reads it.
+    """
+    def __init__(self, *args):
+        super().__init__(set, *args)
+        self.version = 0
+
+    def __setitem__(self, key, value):
+        self.version += 1
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self.version += 1
+        super().__delitem__(key)
+
+    def __reduce__(self):
+        return (type(self), (), None, None, iter(self.items()))
+
+@_profiled_pass
 def compute_first_sets(grammar_tokens):
-    FIRST = defaultdict(set)
+    FIRST = FirstSets()
 
     nonterminals = set(grammar_tokens.keys())
     symbols = set()
@@ -300,9 +634,11 @@ def compute_first_sets(grammar_tokens):
     for nt in nonterminals:
         FIRST[nt] = set()
 
+    rounds = 0
     changed = True
     while changed:
         changed = False
+        rounds += 1
         for nt, prods in grammar_tokens.items():
             for prod in prods:
                 if not prod:
@@ -326,6 +662,8 @@ def compute_first_sets(grammar_tokens):
                     if EPSILON not in FIRST[nt]:
                         FIRST[nt].add(EPSILON)
                         changed = True
+    if _profiler is not None:
+        _profiler.count('first_fixpoint_rounds', rounds)
     return FIRST
 
 def pretty_print_first_sets(FIRST):
@@ -352,32 +690,158 @@ def first_of_sequence(seq, FIRST):
     result.add(EPSILON)
     return result
 
-def compute_follow_sets(grammar_tokens, FIRST, start_symbol):
+class FirstSequenceCache:
+    """
+    Bounded LRU memo of first_of_sequence results, keyed by symbol tuples (build_tokenized_grammar
+    interns every token, so key hashing/comparison mostly hits identical string objects).
+    Entries are stored split as (frozenset without ε, nullable flag) so the FOLLOW and table
+    loops can test/merge them without building temporary sets; the frozensets are shared.
+    sync() drops every entry when FIRST is another dict or its FirstSets.version moved (a plain
+    dict has no version, so it always counts as moved). An editor that knows which symbols it
+    changed calls invalidate(symbols) instead: only entries whose value read one of them go,
+    and the current version is taken as the new stamp.
+    The one-shot FOLLOW pass does not use it; construct_parsing_table fills it with FIRST of
+    every production when given one, which the incremental engine and later queries reuse.
+    """
+    def __init__(self, FIRST, maxsize=4096):
+        self.FIRST = FIRST
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._readers = defaultdict(set)    # symbol -> keys whose value read FIRST[symbol]
+        self._stamp = self._version()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @classmethod
+    def for_grammar(cls, FIRST, grammar_tokens):
+        """A cache bounded by the number of distinct production suffixes, so it never evicts."""
+        suffixes = sum(len(p) + 1 for prods in grammar_tokens.values() for p in prods)
+        return cls(FIRST, maxsize=max(suffixes, 1))
+
+    def _version(self):
+        return (id(self.FIRST), getattr(self.FIRST, 'version', object()))
+
+    def sync(self, FIRST=None):
+        if FIRST is not None:
+            self.FIRST = FIRST
+        stamp = self._version()
+        if stamp != self._stamp:
+            self.invalidate()
+
+    def invalidate(self, symbols=None):
+        """Drop every entry, or only those that depend on FIRST of one of symbols."""
+        entries = self._entries
+        if symbols is None:
+            dropped = bool(entries)
+            entries.clear()
+            self._readers.clear()
+        else:
+            dropped = False
+            readers = self._readers
+            for sym in symbols:
+                for key in readers.pop(sym, ()):
+                    if entries.pop(key, None) is not None:
+                        dropped = True
+        if dropped:
+            self.invalidations += 1
+        self._stamp = self._version()
+
+    def split(self, seq):
+        """(FIRST(seq) - {ε}, ε in FIRST(seq))"""
+        key = seq if type(seq) is tuple else tuple(seq)
+        entries = self._entries
+        found = entries.get(key)
+        if found is not None:
+            entries.move_to_end(key)
+            self.hits += 1
+            return found
+        self.misses += 1
+        FIRST = self.FIRST
+        first = first_of_sequence(key, FIRST)
+        nullable = EPSILON in first
+        first.discard(EPSILON)
+        found = (frozenset(first), nullable)
+        entries[key] = found
+        # the value read FIRST of every symbol up to the first non-nullable one
+        readers = self._readers
+        for sym in key:
+            readers[sym].add(key)
+            if EPSILON not in FIRST.get(sym, ()):
+                break
+        if len(entries) > self.maxsize:
+            old, _ = entries.popitem(last=False)
+            for sym in old:
+                keys = readers.get(sym)
+                if keys is not None:
+                    keys.discard(old)
+            self.evictions += 1
+        return found
+
+    def get(self, seq):
+        """Same result as first_of_sequence(seq, FIRST), as a frozenset."""
+        rest, nullable = self.split(seq)
+        return rest | {EPSILON} if nullable else rest
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+@_profiled_pass
+def compute_follow_sets(grammar_tokens, FIRST, start_symbol, first_cache=None):
+    if first_cache is not None:
+        first_cache.sync(FIRST)
+        hits_before = first_cache.hits
     nonterminals = list(grammar_tokens.keys())
     FOLLOW = {nt: set() for nt in nonterminals}
     FOLLOW[start_symbol].add('$')
 
+    # FIRST(beta) never changes during the fixpoint: add it once, and keep only the
+    # FOLLOW(A) -> FOLLOW(B) edges of nullable suffixes for the rounds
+    edges = []
+    for A, prods in grammar_tokens.items():
+        for prod in prods:
+            for i, B in enumerate(prod):
+                if B not in grammar_tokens:
+                    continue
+                if first_cache is not None:
+                    to_add, beta_nullable = first_cache.split(prod[i+1:])
+                else:
+                    to_add = first_of_sequence(prod[i+1:], FIRST)
+                    beta_nullable = EPSILON in to_add
+                    to_add.discard(EPSILON)
+                FOLLOW[B].update(to_add)
+                if beta_nullable and A != B:
+                    edges.append((FOLLOW[A], FOLLOW[B]))
+
+    rounds = 0
     changed = True
     while changed:
         changed = False
-        for A, prods in grammar_tokens.items():
-            for prod in prods:
-                for i, B in enumerate(prod):
-                    if B not in grammar_tokens:
-                        continue
-                    beta = prod[i+1:]
-                    first_beta = first_of_sequence(beta, FIRST)
-                    to_add = set(first_beta) - {EPSILON}
-                    if to_add - FOLLOW[B]:
-                        FOLLOW[B].update(to_add)
-                        changed = True
-                    if EPSILON in first_beta or not beta:
-                        if FOLLOW[A] - FOLLOW[B]:
-                            FOLLOW[B].update(FOLLOW[A])
-                            changed = True
+        rounds += 1
+        for follow_A, follow_B in edges:
+            if not follow_A <= follow_B:
+                follow_B |= follow_A
+                changed = True
+    if _profiler is not None:
+        _profiler.count('follow_fixpoint_rounds', rounds)
+        if first_cache is not None:
+            _profiler.count('first_cache_hits', first_cache.hits - hits_before)
     return FOLLOW
 
-def construct_parsing_table(grammar_tokens, FIRST, FOLLOW):
+@_profiled_pass
+def construct_parsing_table(grammar_tokens, FIRST, FOLLOW, first_cache=None):
+    if first_cache is not None:
+        first_cache.sync(FIRST)
     table = {}
     conflicts = []
     nonterminals = list(grammar_tokens.keys())
@@ -385,21 +849,26 @@ def construct_parsing_table(grammar_tokens, FIRST, FOLLOW):
     for nt, prods in grammar_tokens.items():
         for prod in prods:
             for tok in prod:
-                if tok != EPSILON and tok not in nonterminals:
+                if tok != EPSILON and tok not in grammar_tokens:
                     terminals.add(tok)
     terminals_list = sorted(terminals)
     all_terminals = terminals_list + ['$']
 
     for A in nonterminals:
         for prod in grammar_tokens[A]:
-            first_seq = first_of_sequence(prod, FIRST)
-            for a in (first_seq - {EPSILON}):
+            if first_cache is not None:
+                first_rest, prod_nullable = first_cache.split(prod)
+            else:
+                first_seq = first_of_sequence(prod, FIRST)
+                prod_nullable = EPSILON in first_seq
+                first_rest = first_seq - {EPSILON}
+            for a in first_rest:
                 key = (A, a)
                 if key in table and table[key] != prod:
                     conflicts.append((A, a, table[key], prod))
                 else:
                     table[key] = prod
-            if EPSILON in first_seq:
+            if prod_nullable:
                 for b in FOLLOW[A]:
                     key = (A, b)
                     if key in table and table[key] != prod:
@@ -409,10 +878,64 @@ def construct_parsing_table(grammar_tokens, FIRST, FOLLOW):
     is_ll1 = len(conflicts) == 0
     return table, is_ll1, conflicts, sorted(all_terminals)
 
+def analyse_grammar(rules, factoring_engine='trie'):
+    """
+    Quiet end-to-end run of the passes above on rule lines ('A -> x | y').
+    Returns a dict with every intermediate result, for scripts that build on the table.
+    """
+    parsed_rules, left_recursive_count = detect_left_recursion(rules, verbose=False)
+    _, total_fact_groups = detection_left_factoring(parsed_rules, verbose=False, engine=factoring_engine)
+    if total_fact_groups > 0:
+        final_grammar = removal_left_factoring(parsed_rules, verbose=False, engine=factoring_engine)
+    else:
+        final_grammar = parsed_rules
+
+    grammar_tokens, _, _, _ = build_tokenized_grammar(final_grammar)
+    start_symbol = final_grammar[0][0] if final_grammar else None
+    grammar_tokens, reduction_report = reduce_grammar(grammar_tokens, start_symbol, verbose=False)
+
+    FIRST = compute_first_sets(grammar_tokens)
+    FOLLOW = compute_follow_sets(grammar_tokens, FIRST, start_symbol)
+    # the table pass leaves FIRST of every production in the cache for later queries
+    first_cache = FirstSequenceCache.for_grammar(FIRST, grammar_tokens)
+    table, is_ll1, conflicts, terminals_sorted = construct_parsing_table(grammar_tokens, FIRST, FOLLOW, first_cache)
+    return {
+        'left_recursive_count': left_recursive_count,
+        'factoring_groups': total_fact_groups,
+        'final_grammar': final_grammar,
+        'reduction_report': reduction_report,
+        'grammar_tokens': grammar_tokens,
+        'start_symbol': start_symbol,
+        'FIRST': FIRST,
+        'FOLLOW': FOLLOW,
+        'first_cache': first_cache,
+        'table': table,
+        'is_ll1': is_ll1,
+        'conflicts': conflicts,
+        'terminals': terminals_sorted,
+    }
+
 # ----------------------------
 # INPUT SECTION (where you enter grammar) and function calls
 # ----------------------------
 if __name__ == "__main__":
+    import argparse
+    # the writers import this module, so they are only loaded when run as a script
+    from ccl_8_2254_writers import FORMATS, write_analysis
+    ap = argparse.ArgumentParser(description="Left recursion / left factoring / FIRST for a grammar read from stdin.")
+    ap.add_argument('--profile', action='store_true', help="print a per-pass profile after the run")
+    ap.add_argument('--profile-json', help="also export the profile as JSON to this file")
+    ap.add_argument('--profile-folded', help="also export flame-graph folded stacks to this file")
+    ap.add_argument('--factoring-engine', choices=FACTORING_ENGINES, default='trie',
+                    help="left-factoring detection: prefix trie, or sorted productions + LCP array")
+    ap.add_argument('--output-format', choices=FORMATS,
+                    help="also compute FOLLOW and the parse table, and write grammar / FIRST / FOLLOW / table "
+                         "files in this format")
+    ap.add_argument('--out-dir', default='.', help="directory for the --output-format files")
+    args = ap.parse_args()
+    if args.profile or args.profile_json or args.profile_folded:
+        enable_profiling()
+
     n = int(input("Enter number of rules: "))
     rules = []
     for _ in range(n):
@@ -425,11 +948,12 @@ if __name__ == "__main__":
     # without_left_recursion = remove_left_recursion(parsed_rules)
 
     # 3) Left factoring detection (prints once)
-    factoring_map, total_fact_groups = detection_left_factoring(parsed_rules, verbose=True)
+    factoring_map, total_fact_groups = detection_left_factoring(parsed_rules, verbose=True,
+                                                                engine=args.factoring_engine)
 
     # 4) Left factoring removal (if any) - internally uses quiet detection
     if total_fact_groups > 0:
-        final_grammar = removal_left_factoring(parsed_rules)
+        final_grammar = removal_left_factoring(parsed_rules, engine=args.factoring_engine)
     else:
         print("\nNo left factoring groups found; grammar unchanged after factoring pass.")
         final_grammar = parsed_rules
@@ -443,6 +967,9 @@ if __name__ == "__main__":
     else:
         start_symbol = None
 
+    # 6) Reduce grammar (drop non-generating / unreachable symbols) before FIRST and the table
+    grammar_tokens, reduction_report = reduce_grammar(grammar_tokens, start_symbol)
+
     # Compute FIRST sets (printed once)
     FIRST = compute_first_sets(grammar_tokens)
     pretty_print_first_sets(FIRST)
@@ -454,4 +981,26 @@ if __name__ == "__main__":
     # table, is_ll1, conflicts, terminals_sorted = construct_parsing_table(grammar_tokens, FIRST, FOLLOW)
     # pretty_print_parsing_table(table, list(grammar_tokens.keys()), terminals_sorted, grammar_tokens)
 
-    print("\n--- FIRST sets computed. FOLLOW and parse table computation are commented out. ---")
+    if args.output_format:
+        FOLLOW = compute_follow_sets(grammar_tokens, FIRST, start_symbol)
+        first_cache = FirstSequenceCache.for_grammar(FIRST, grammar_tokens)
+        table, is_ll1, conflicts, terminals_sorted = construct_parsing_table(grammar_tokens, FIRST, FOLLOW, first_cache)
+        res = {'final_grammar': final_grammar, 'FIRST': FIRST, 'FOLLOW': FOLLOW, 'table': table}
+        paths, counts = write_analysis(res, args.out_dir, args.output_format)
+        print()
+        for name, path in paths.items():
+            print(f"{name}: {counts[name]} records -> {path}")
+        print(f"\n--- Grammar is {'LL(1)' if is_ll1 else f'not LL(1) ({len(conflicts)} conflicts)'}. ---")
+    else:
+        print("\n--- FIRST sets computed. FOLLOW and parse table computation are commented out. ---")
+
+    if _profiler is not None:
+        if args.profile:
+            print()
+            print(_profiler.flame_summary())
+        if args.profile_json:
+            _profiler.to_json(args.profile_json)
+        if args.profile_folded:
+            with open(args.profile_folded, 'w', encoding='utf-8') as f:
+                f.write('\n'.join(_profiler.folded_stacks()) + '\n')
+        disable_profiling()
@@ -0,0 +1,160 @@
+# ----------------------------
+# Batch membership test: many sentences against one compiled LL(1) grammar.
+#
+# The grammar is analysed and compressed once (compress_parsing_table). Sentences are turned
+# into terminal ids in the parent with the table's one term_ids dict, identical sentences are
+# parsed only once, and the encoded inputs go to a process pool in chunks as one flat int array
+# plus offsets. Each worker receives the compressed table once, through the pool initializer,
+# and runs predictive_parse on its chunk.
+#
+# usage: python ccl_8_2254_membership.py grammar.txt sentences.txt [--workers N] [--chunk 2000]
+#                                       [--output results.jsonl]
+#        sentences.txt: one space-separated sentence per line
+# ----------------------------
+import json
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from ccl_8_2254_main import analyse_grammar
+from ccl_8_2254_table import compress_parsing_table, predictive_parse
+
+
+class CompiledGrammar:
+    def __init__(self, rules):
+        res = analyse_grammar(rules)
+        self.start_symbol = res['start_symbol']
+        self.is_ll1 = res['is_ll1']
+        self.conflicts = res['conflicts']
+        self.table = compress_parsing_table(res['table'], res['grammar_tokens'], res['terminals'])
+
+    def parse(self, tokens):
+        """(accepted, error_position) for one token list; error_position is -1 when accepted."""
+        return predictive_parse(self.table, self.table.encode(tokens), self.start_symbol)
+
+
+# ---------- worker side ----------
+_worker_table = None
+_worker_start = None
+
+
+def _init_worker(table, start_symbol):
+    global _worker_table, _worker_start
+    _worker_table = table
+    _worker_start = start_symbol
+
+
+def _parse_chunk(flat, offsets):
+    """Parse the sentences flat[offsets[i]:offsets[i+1]]; returns array of accepted flags and positions."""
+    ct, start = _worker_table, _worker_start
+    accepted = array('b')
+    positions = array('i')
+    for i in range(len(offsets) - 1):
+        ok, pos = predictive_parse(ct, flat[offsets[i]:offsets[i + 1]], start)
+        accepted.append(ok)
+        positions.append(pos)
+    return accepted, positions
+
+
+def _encode_chunks(table, sentences, chunk):
+    """Yield (flat ids, offsets) per chunk of distinct sentences; each sentence ends with '$'."""
+    term_ids = table.term_ids
+    end_id = table.end_id
+    for lo in range(0, len(sentences), chunk):
+        flat = array('i')
+        offsets = array('i', [0])
+        for tokens in sentences[lo:lo + chunk]:
+            flat.extend(term_ids.get(t, -1) for t in tokens)
+            flat.append(end_id)
+            offsets.append(len(flat))
+        yield flat, offsets
+
+
+def check_membership(compiled, sentences, workers=None, chunk=2000):
+    """
+    sentences: list of token lists (or space-separated strings).
+    Returns (results, stats): results[i] = (accepted, error_position) for sentences[i];
+    stats has counts, elapsed seconds and sentences per second.
+    """
+    t0 = time.perf_counter()
+    token_lists = [s.split() if isinstance(s, str) else s for s in sentences]
+    # parse each distinct sentence once
+    slot = {}
+    distinct = []
+    index = []
+    for tokens in token_lists:
+        key = tuple(tokens)
+        k = slot.get(key)
+        if k is None:
+            k = slot[key] = len(distinct)
+            distinct.append(tokens)
+        index.append(k)
+
+    accepted = array('b')
+    positions = array('i')
+    chunks = list(_encode_chunks(compiled.table, distinct, chunk))
+    if workers == 1 or len(chunks) <= 1:
+        _init_worker(compiled.table, compiled.start_symbol)
+        parts = (_parse_chunk(flat, offsets) for flat, offsets in chunks)
+        for acc, pos in parts:
+            accepted.extend(acc)
+            positions.extend(pos)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(compiled.table, compiled.start_symbol)) as pool:
+            for acc, pos in pool.map(_parse_chunk, *zip(*chunks)):
+                accepted.extend(acc)
+                positions.extend(pos)
+
+    results = [(bool(accepted[k]), positions[k]) for k in index]
+    elapsed = time.perf_counter() - t0
+    n_accepted = sum(1 for ok, _ in results if ok)
+    stats = {
+        'sentences': len(results),
+        'distinct': len(distinct),
+        'accepted': n_accepted,
+        'rejected': len(results) - n_accepted,
+        'seconds': elapsed,
+        'sentences_per_second': len(results) / elapsed if elapsed > 0 else float('inf'),
+    }
+    return results, stats
+
+
+if __name__ == "__main__":
+    import argparse
+    from ccl_8_2254_batch import read_grammar_file
+
+    ap = argparse.ArgumentParser(description="Check many sentences against one LL(1) grammar.")
+    ap.add_argument('grammar', help="grammar file ('A -> x | y' per line)")
+    ap.add_argument('sentences', help="one space-separated sentence per line")
+    ap.add_argument('--workers', type=int, default=None)
+    ap.add_argument('--chunk', type=int, default=2000, help="sentences per pool task")
+    ap.add_argument('--output', help="write one JSON result per sentence here")
+    args = ap.parse_args()
+
+    compiled = CompiledGrammar(read_grammar_file(args.grammar))
+    if not compiled.is_ll1:
+        print(f"Note: grammar is not LL(1) ({len(compiled.conflicts)} conflicts); first entry kept per cell, "
+              "sentences that would make it expand forever are rejected.")
+    with open(args.sentences, encoding='utf-8') as f:
+        sentences = [line.split() for line in f]
+
+    results, stats = check_membership(compiled, sentences, args.workers, args.chunk)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as out:
+            for i, ((ok, pos), tokens) in enumerate(zip(results, sentences), start=1):
+                rec = {'line': i, 'accepted': ok}
+                if not ok:
+                    rec['error_position'] = pos
+                    rec['error_token'] = tokens[pos] if pos < len(tokens) else '$'
+                out.write(json.dumps(rec, ensure_ascii=False) + '\n')
+    else:
+        for i, ((ok, pos), tokens) in enumerate(zip(results, sentences), start=1):
+            if not ok:
+                where = tokens[pos] if pos < len(tokens) else 'end of input'
+                print(f"line {i}: rejected at token {pos} ({where})")
+
+    print(f"\nSentences: {stats['sentences']} ({stats['distinct']} distinct)")
+    print(f"Accepted: {stats['accepted']}  Rejected: {stats['rejected']}")
+    print(f"Time: {stats['seconds']:.3f}s ({stats['sentences_per_second']:.0f} sentences/s)")
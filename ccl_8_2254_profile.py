@@ -0,0 +1,113 @@
+# ----------------------------
+# Per-pass instrumentation for the ccl_8 grammar pipeline.
+# ccl_8_2254_main.enable_profiling() installs a PassProfiler; while none is installed the
+# passes only pay one global lookup per call.
+# ----------------------------
+import json
+import time
+import tracemalloc
+
+
+class PassProfiler:
+    """
+    Collects per-pass wall time, call counts and peak traced memory, plus named counters
+    (fixpoint rounds, trie nodes, productions tokenized, ...).
+    Passes may nest (removal_left_factoring calls detection_left_factoring); each pass is
+    recorded under its full call path, e.g. 'removal_left_factoring;detection_left_factoring'.
+    """
+
+    def __init__(self, trace_memory=True):
+        self.trace_memory = trace_memory
+        self.passes = {}
+        self.counters = {}
+        self._stack = []
+        self._started_tracemalloc = False
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+    def close(self):
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    # ---------- hooks called from the passes ----------
+    def start_pass(self, name):
+        if self.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if self._stack:
+                # keep the parent's peak before the child resets it
+                parent = self._stack[-1]
+                parent[3] = max(parent[3], peak - parent[2])
+            tracemalloc.reset_peak()
+            base = current
+        else:
+            base = 0
+        path = name if not self._stack else self._stack[-1][0] + ';' + name
+        # registered on entry so report order follows first-call order, parents first
+        self.passes.setdefault(path, {'calls': 0, 'seconds': 0.0, 'peak_bytes': 0})
+        self._stack.append([path, time.perf_counter(), base, 0])
+
+    def end_pass(self, name):
+        path, t0, base, child_peak = self._stack.pop()
+        elapsed = time.perf_counter() - t0
+        peak = 0
+        if self.trace_memory:
+            peak = max(tracemalloc.get_traced_memory()[1] - base, child_peak)
+            if self._stack:
+                parent = self._stack[-1]
+                parent[3] = max(parent[3], peak + base - parent[2])
+        entry = self.passes[path]
+        entry['calls'] += 1
+        entry['seconds'] += elapsed
+        entry['peak_bytes'] = max(entry['peak_bytes'], peak)
+
+    def count(self, key, n=1):
+        self.counters[key] = self.counters.get(key, 0) + n
+
+    # ---------- export ----------
+    def report(self):
+        return {'passes': self.passes, 'counters': self.counters}
+
+    def to_json(self, path=None):
+        text = json.dumps(self.report(), indent=2, ensure_ascii=False)
+        if path is not None:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(text + '\n')
+        return text
+
+    def _self_seconds(self):
+        own = {p: e['seconds'] for p, e in self.passes.items()}
+        for p, e in self.passes.items():
+            if ';' in p:
+                parent = p.rsplit(';', 1)[0]
+                if parent in own:
+                    own[parent] -= e['seconds']
+        return own
+
+    def folded_stacks(self):
+        """
+        Flame-graph 'folded' lines ('outer;inner <self microseconds>'), ready for flamegraph.pl.
+        """
+        own = self._self_seconds()
+        return [f"{p} {max(0, int(round(s * 1e6)))}" for p, s in sorted(own.items())]
+
+    def flame_summary(self, width=30):
+        """
+        Indented text tree of passes with a bar proportional to total wall time.
+        """
+        roots = [e['seconds'] for p, e in self.passes.items() if ';' not in p]
+        total = sum(roots) or 1.0
+        lines = ["--- Pass profile ---"]
+        for p, e in self.passes.items():
+            depth = p.count(';')
+            name = p.rsplit(';', 1)[-1]
+            bar = '#' * max(1, int(round(width * e['seconds'] / total)))
+            label = '  ' * depth + name
+            lines.append(f"{label:<40}{e['seconds'] * 1000:>10.3f} ms  x{e['calls']:<5}"
+                         f"{e['peak_bytes'] / 1024:>10.1f} KiB  {bar}")
+        if self.counters:
+            lines.append("--- Counters ---")
+            for key in sorted(self.counters):
+                lines.append(f"{key:<40}{self.counters[key]:>10}")
+        return '\n'.join(lines)
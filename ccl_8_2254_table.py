@@ -0,0 +1,268 @@
+# ----------------------------
+# Compressed LL(1) parse table (row displacement / comb vector) and a predictive parser on it.
+#
+# construct_parsing_table returns {(A, a): [tokens...]}. Here every nonterminal, terminal and
+# production gets a small integer id and the table is packed into three int arrays:
+#   base[A]   displacement of row A inside the comb (-1 for an all-error row)
+#   check[i]  displacement of the row that owns slot i (so entries of other rows are rejected)
+#   value[i]  production id stored in slot i
+# Lookup is base[A] + a followed by one check: M[A, a] = value[i] if check[i] == base[A].
+# Identical rows share one displacement; every all-error row shares base -1 and uses no slots.
+#
+# usage: python ccl_8_2254_table.py grammar.txt [--parse "id + id"] [--repeat 5]
+#        python ccl_8_2254_table.py --generate expression 50
+# ----------------------------
+import sys
+import time
+from array import array
+
+from ccl_8_2254_main import EPSILON
+
+_EMPTY = -2   # check value of an unused slot; never equal to a real base or to -1
+
+
+class CompressedTable:
+    def __init__(self, nonterminals, terminals, productions, base, check, value):
+        self.nonterminals = nonterminals
+        self.terminals = terminals
+        self.productions = productions          # [(A, (tokens...)), ...] indexed by production id
+        self.nt_ids = {A: i for i, A in enumerate(nonterminals)}
+        self.term_ids = {t: i for i, t in enumerate(terminals)}
+        self.base = base
+        self.check = check
+        self.value = value
+        self.end_id = self.term_ids['$']
+        # right-hand sides pre-encoded for the parser stack:
+        # terminal t -> term id (>= 0), nonterminal A -> -(nt id + 1)
+        self.rhs_codes = []
+        for A, rhs in productions:
+            codes = []
+            for tok in rhs:
+                if tok == EPSILON:
+                    continue
+                if tok in self.nt_ids:
+                    codes.append(-(self.nt_ids[tok] + 1))
+                else:
+                    codes.append(self.term_ids[tok])
+            self.rhs_codes.append(tuple(reversed(codes)))
+        # Without consuming a token, an expansion tree deeper than len(nonterminals) repeats a
+        # nonterminal under itself on the same lookahead and would loop (left recursion in a
+        # non-LL(1) table). Such a tree leaves at most this many symbols above its root's slot.
+        self.max_growth = len(nonterminals) * max((len(c) for c in self.rhs_codes), default=1)
+
+    def lookup(self, nt_id, term_id):
+        """Production id for M[nt_id, term_id], or -1 for an error entry."""
+        b = self.base[nt_id]
+        i = b + term_id
+        if self.check[i] == b:
+            return self.value[i]
+        return -1
+
+    def get(self, A, a):
+        """Dict-style access: the production's token list, or None."""
+        nt_id = self.nt_ids.get(A)
+        term_id = self.term_ids.get(a)
+        if nt_id is None or term_id is None:
+            return None
+        pid = self.lookup(nt_id, term_id)
+        return list(self.productions[pid][1]) if pid >= 0 else None
+
+    def encode(self, tokens):
+        """Terminal names -> term ids (unknown tokens become -1), with '$' appended."""
+        get = self.term_ids.get
+        ids = array('i', (get(t, -1) for t in tokens))
+        ids.append(self.end_id)
+        return ids
+
+    def nbytes(self):
+        return sum(a.itemsize * len(a) for a in (self.base, self.check, self.value))
+
+
+def compress_parsing_table(table, grammar_tokens, terminals_sorted):
+    """
+    table, terminals_sorted: as returned by construct_parsing_table (terminals include '$').
+    Returns a CompressedTable answering exactly the same (A, a) lookups.
+    """
+    nonterminals = list(grammar_tokens.keys())
+    terminals = list(terminals_sorted)
+    if '$' not in terminals:
+        terminals.append('$')
+    term_ids = {t: i for i, t in enumerate(terminals)}
+    ncols = len(terminals)
+
+    productions = []
+    prod_ids = {}
+    for A in nonterminals:
+        for prod in grammar_tokens[A]:
+            key = (A, tuple(prod))
+            if key not in prod_ids:
+                prod_ids[key] = len(productions)
+                productions.append(key)
+
+    rows = {A: [] for A in nonterminals}
+    for (A, a), prod in table.items():
+        rows[A].append((term_ids[a], prod_ids[(A, tuple(prod))]))
+
+    # place dense rows first (first-fit), identical rows once
+    base = array('i', [-1] * len(nonterminals))
+    check = array('i')
+    value = array('i')
+    used_bases = set()
+    placed = {}
+    order = sorted(range(len(nonterminals)), key=lambda r: -len(rows[nonterminals[r]]))
+    for r in order:
+        entries = sorted(rows[nonterminals[r]])
+        if not entries:
+            continue
+        signature = tuple(entries)
+        if signature in placed:
+            base[r] = placed[signature]
+            continue
+        d = 0
+        while True:
+            if d not in used_bases and all(
+                    d + c >= len(check) or check[d + c] == _EMPTY for c, _ in entries):
+                break
+            d += 1
+        need = d + ncols
+        if need > len(check):
+            check.extend([_EMPTY] * (need - len(check)))
+            value.extend([-1] * (need - len(value)))
+        for c, pid in entries:
+            check[d + c] = d
+            value[d + c] = pid
+        used_bases.add(d)
+        placed[signature] = d
+        base[r] = d
+
+    # an all-error row (base -1) probes slots -1 .. ncols-2; keep them in range
+    if len(check) < ncols:
+        check.extend([_EMPTY] * (ncols - len(check)))
+        value.extend([-1] * (ncols - len(value)))
+    return CompressedTable(nonterminals, terminals, productions, base, check, value)
+
+
+def predictive_parse(ct, token_ids, start_symbol):
+    """
+    Table-driven LL(1) parse of an encoded input (see CompressedTable.encode).
+    Returns (accepted, error_position); error_position is the index of the offending token or -1.
+    A table that keeps expanding without consuming (left recursion) rejects at that token.
+    """
+    base, check, value, rhs_codes = ct.base, ct.check, ct.value, ct.rhs_codes
+    end_id = ct.end_id
+    max_growth = ct.max_growth
+    stack = [end_id, -(ct.nt_ids[start_symbol] + 1)]
+    pos = 0
+    a = token_ids[0]
+    low = len(stack)      # lowest stack height since the last consumed token
+    while True:
+        top = stack.pop()
+        if top >= 0:
+            if top != a:
+                return False, pos
+            if a == end_id:
+                return True, -1
+            pos += 1
+            a = token_ids[pos]
+            low = len(stack)
+            continue
+        if a < 0:
+            return False, pos
+        b = base[-top - 1]
+        i = b + a
+        if check[i] != b:
+            return False, pos
+        if len(stack) < low:
+            low = len(stack)
+        stack.extend(rhs_codes[value[i]])
+        if len(stack) - low > max_growth:
+            return False, pos
+
+
+# ----------------------------
+# Dict vs compressed comparison
+# ----------------------------
+def _dict_table_bytes(table):
+    size = sys.getsizeof(table)
+    for key, prod in table.items():
+        size += sys.getsizeof(key) + sys.getsizeof(prod)
+    return size
+
+
+def compare_table_storage(table, ct, repeat=5):
+    """
+    Memory of the dict table (container, key tuples, production lists) against the three
+    comb arrays, and best-of-`repeat` time to probe every (A, a) cell through each form.
+    """
+    cells = [(A, a) for A in ct.nonterminals for a in ct.terminals]
+    id_cells = [(ct.nt_ids[A], ct.term_ids[a]) for A, a in cells]
+
+    def time_dict():
+        get = table.get
+        t0 = time.perf_counter()
+        for A, a in cells:
+            get((A, a))
+        return time.perf_counter() - t0
+
+    def time_comb():
+        # inlined the way predictive_parse indexes the arrays
+        base, check, value = ct.base, ct.check, ct.value
+        t0 = time.perf_counter()
+        for r, c in id_cells:
+            b = base[r]
+            i = b + c
+            if check[i] == b:
+                value[i]
+        return time.perf_counter() - t0
+
+    dict_s = min(time_dict() for _ in range(repeat))
+    comb_s = min(time_comb() for _ in range(repeat))
+    n = max(1, len(cells))
+    return {
+        'nonterminals': len(ct.nonterminals),
+        'terminals': len(ct.terminals),
+        'entries': len(table),
+        'comb_slots': len(ct.check),
+        'dict_bytes': _dict_table_bytes(table),
+        'compressed_bytes': ct.nbytes(),
+        'dict_ns_per_lookup': dict_s / n * 1e9,
+        'compressed_ns_per_lookup': comb_s / n * 1e9,
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+    from ccl_8_2254_batch import read_grammar_file
+    from ccl_8_2254_grammar_gen import GENERATORS, generate_grammar
+    from ccl_8_2254_main import analyse_grammar
+
+    ap = argparse.ArgumentParser(description="Compress an LL(1) table and compare it with the dict form.")
+    ap.add_argument('grammar', nargs='?', help="grammar file ('A -> x | y' per line)")
+    ap.add_argument('--generate', nargs=2, metavar=('KIND', 'SIZE'),
+                    help=f"use a generated grammar instead ({', '.join(sorted(GENERATORS))})")
+    ap.add_argument('--parse', help="space-separated sentence to parse with the compressed table")
+    ap.add_argument('--repeat', type=int, default=5)
+    args = ap.parse_args()
+
+    if args.generate:
+        rules = generate_grammar(args.generate[0], int(args.generate[1]))
+    elif args.grammar:
+        rules = read_grammar_file(args.grammar)
+    else:
+        ap.error("give a grammar file or --generate KIND SIZE")
+
+    res = analyse_grammar(rules)
+    ct = compress_parsing_table(res['table'], res['grammar_tokens'], res['terminals'])
+    stats = compare_table_storage(res['table'], ct, args.repeat)
+
+    print("\n--- Parse table storage ---")
+    print(f"Nonterminals x terminals: {stats['nonterminals']} x {stats['terminals']} "
+          f"({stats['entries']} entries, {stats['comb_slots']} comb slots)")
+    print(f"dict table:       {stats['dict_bytes']:>10} bytes  {stats['dict_ns_per_lookup']:8.1f} ns/lookup")
+    print(f"compressed table: {stats['compressed_bytes']:>10} bytes  {stats['compressed_ns_per_lookup']:8.1f} ns/lookup")
+    if not res['is_ll1']:
+        print(f"Note: grammar is not LL(1) ({len(res['conflicts'])} conflicts); first entry kept per cell.")
+
+    if args.parse is not None:
+        ok, pos = predictive_parse(ct, ct.encode(args.parse.split()), res['start_symbol'])
+        print(f"\nParse '{args.parse}': " + ("accepted" if ok else f"rejected at token {pos}"))
@@ -0,0 +1,254 @@
+# ----------------------------
+# Streaming writers for the big outputs of ccl_8_2254_main: the transformed grammar
+# (removal_left_factoring / remove_left_recursion result), FIRST / FOLLOW sets, and the
+# LL(1) parse table. Records go straight to a buffered file one at a time; no report is
+# ever joined into a single string.
+#
+# Formats:
+#   text    - the same lines the pretty printers show ('A -> x | y', 'FIRST(A) = { a, b }',
+#             'M[A, a] = A -> x y')
+#   jsonl   - one JSON object per record
+#   binary  - 'CCL8' + kind byte, then records of LEB128 varints. A symbol is written in full
+#             the first time it appears (0, byte length, utf-8) and as its id + 1 afterwards,
+#             so every name is stored once. read_binary() streams records back.
+#
+# usage: python ccl_8_2254_writers.py grammar.txt --out-dir out/ [--format text|jsonl|binary]
+#        python ccl_8_2254_writers.py --dump out/table.bin
+# ----------------------------
+import json
+import os
+
+from ccl_8_2254_main import EPSILON
+
+FORMATS = ('text', 'jsonl', 'binary')
+MAGIC = b'CCL8'
+KIND_GRAMMAR, KIND_SETS, KIND_TABLE = b'G', b'S', b'T'
+_BUFFER = 1 << 16
+
+
+class _BinaryWriter:
+    def __init__(self, f, kind):
+        self.f = f
+        self.buf = bytearray(MAGIC + kind)
+        self.ids = {}
+
+    def uint(self, n):
+        buf = self.buf
+        while n >= 0x80:
+            buf.append((n & 0x7F) | 0x80)
+            n >>= 7
+        buf.append(n)
+
+    def sym(self, s):
+        sid = self.ids.get(s)
+        if sid is not None:
+            self.uint(sid + 1)
+            return
+        self.ids[s] = len(self.ids)
+        data = s.encode('utf-8')
+        self.uint(0)
+        self.uint(len(data))
+        self.buf += data
+
+    def end_record(self):
+        if len(self.buf) >= _BUFFER:
+            self.flush()
+
+    def flush(self):
+        self.f.write(self.buf)
+        self.buf.clear()
+
+
+class _BinaryReader:
+    def __init__(self, f):
+        self.f = f
+        self.names = []
+
+    def uint(self):
+        n = shift = 0
+        while True:
+            b = self.f.read(1)
+            if not b:
+                raise EOFError
+            b = b[0]
+            n |= (b & 0x7F) << shift
+            if b < 0x80:
+                return n
+            shift += 7
+
+    def sym(self):
+        ref = self.uint()
+        if ref:
+            return self.names[ref - 1]
+        s = self.f.read(self.uint()).decode('utf-8')
+        self.names.append(s)
+        return s
+
+
+def _check_format(fmt):
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown format {fmt!r}; expected one of {FORMATS}")
+
+
+def _open(path, fmt):
+    if fmt == 'binary':
+        return open(path, 'wb', buffering=_BUFFER)
+    return open(path, 'w', encoding='utf-8', buffering=_BUFFER)
+
+
+def write_grammar(rules, path, fmt='text'):
+    """rules: [(nonterminal, [production strings]), ...]. Returns the number of rules written."""
+    _check_format(fmt)
+    count = 0
+    with _open(path, fmt) as f:
+        if fmt == 'binary':
+            w = _BinaryWriter(f, KIND_GRAMMAR)
+        for nt, prods in rules:
+            if fmt == 'text':
+                f.write(nt)
+                f.write(' ->')
+                sep = ' '
+                for p in prods:
+                    f.write(sep)
+                    f.write(p)
+                    sep = ' | '
+                f.write('\n')
+            elif fmt == 'jsonl':
+                f.write(json.dumps({'nonterminal': nt, 'productions': prods}, ensure_ascii=False))
+                f.write('\n')
+            else:
+                w.sym(nt)
+                w.uint(len(prods))
+                for p in prods:
+                    w.sym(p)
+                w.end_record()
+            count += 1
+        if fmt == 'binary':
+            w.flush()
+    return count
+
+
+def write_sets(sets, path, fmt='text', label='FIRST'):
+    """sets: {symbol: set of terminals} (FIRST or FOLLOW). Items of each set are written sorted."""
+    _check_format(fmt)
+    count = 0
+    with _open(path, fmt) as f:
+        if fmt == 'binary':
+            w = _BinaryWriter(f, KIND_SETS)
+            w.sym(label)
+        for sym in sorted(sets):
+            items = sorted(sets[sym])
+            if fmt == 'text':
+                f.write(f"{label}({sym}) = {{ ")
+                sep = ''
+                for item in items:
+                    f.write(sep)
+                    f.write(item)
+                    sep = ', '
+                f.write(' }\n')
+            elif fmt == 'jsonl':
+                f.write(json.dumps({'set': label, 'symbol': sym, 'items': items}, ensure_ascii=False))
+                f.write('\n')
+            else:
+                w.sym(sym)
+                w.uint(len(items))
+                for item in items:
+                    w.sym(item)
+                w.end_record()
+            count += 1
+        if fmt == 'binary':
+            w.flush()
+    return count
+
+
+def write_table(table, path, fmt='text'):
+    """table: {(A, a): [tokens...]} as returned by construct_parsing_table; one record per entry."""
+    _check_format(fmt)
+    count = 0
+    with _open(path, fmt) as f:
+        if fmt == 'binary':
+            w = _BinaryWriter(f, KIND_TABLE)
+        for (A, a), prod in table.items():
+            if fmt == 'text':
+                f.write(f"M[{A}, {a}] = {A} -> ")
+                f.write(' '.join(prod) if prod else EPSILON)
+                f.write('\n')
+            elif fmt == 'jsonl':
+                f.write(json.dumps({'nonterminal': A, 'terminal': a, 'production': prod}, ensure_ascii=False))
+                f.write('\n')
+            else:
+                w.sym(A)
+                w.sym(a)
+                w.uint(len(prod))
+                for tok in prod:
+                    w.sym(tok)
+                w.end_record()
+            count += 1
+        if fmt == 'binary':
+            w.flush()
+    return count
+
+
+def read_binary(path):
+    """
+    Stream the records of a binary file back:
+      grammar -> (nonterminal, [productions]),  sets -> (label, symbol, [items]),
+      table   -> (A, a, [tokens])
+    """
+    with open(path, 'rb', buffering=_BUFFER) as f:
+        head = f.read(len(MAGIC) + 1)
+        if head[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path}: not a ccl_8_2254 binary report")
+        kind = head[len(MAGIC):]
+        r = _BinaryReader(f)
+        label = r.sym() if kind == KIND_SETS else None
+        while True:
+            try:
+                first = r.sym()
+            except EOFError:
+                return
+            if kind == KIND_GRAMMAR:
+                yield first, [r.sym() for _ in range(r.uint())]
+            elif kind == KIND_SETS:
+                yield label, first, [r.sym() for _ in range(r.uint())]
+            else:
+                a = r.sym()
+                yield first, a, [r.sym() for _ in range(r.uint())]
+
+
+def write_analysis(res, out_dir, fmt='text'):
+    """Write grammar, FIRST, FOLLOW and table of an analyse_grammar() result into out_dir."""
+    _check_format(fmt)
+    os.makedirs(out_dir, exist_ok=True)
+    ext = {'text': 'txt', 'jsonl': 'jsonl', 'binary': 'bin'}[fmt]
+    paths = {name: os.path.join(out_dir, f"{name}.{ext}") for name in ('grammar', 'first', 'follow', 'table')}
+    counts = {
+        'grammar': write_grammar(res['final_grammar'], paths['grammar'], fmt),
+        'first': write_sets(res['FIRST'], paths['first'], fmt, 'FIRST'),
+        'follow': write_sets(res['FOLLOW'], paths['follow'], fmt, 'FOLLOW'),
+        'table': write_table(res['table'], paths['table'], fmt),
+    }
+    return paths, counts
+
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="Write grammar / FIRST / FOLLOW / parse table to files.")
+    ap.add_argument('grammar', nargs='?', help="grammar file ('A -> x | y' per line)")
+    ap.add_argument('--out-dir', default='.')
+    ap.add_argument('--format', choices=FORMATS, default='text')
+    ap.add_argument('--dump', help="print the records of a binary report instead")
+    args = ap.parse_args()
+
+    if args.dump:
+        for record in read_binary(args.dump):
+            print(record)
+    elif args.grammar:
+        from ccl_8_2254_batch import read_grammar_file
+        from ccl_8_2254_main import analyse_grammar
+        res = analyse_grammar(read_grammar_file(args.grammar))
+        paths, counts = write_analysis(res, args.out_dir, args.format)
+        for name, path in paths.items():
+            print(f"{name}: {counts[name]} records -> {path}")
+    else:
+        ap.error("give a grammar file or --dump FILE")